@@ -0,0 +1,193 @@
+"""
+Benchmark of the entity path: a service call goes through the lights, the fade batch and the output
+loop until the packets arrive at a local UDP sink.
+
+Sets up synthetic installs of the given sizes with the light platform of a bare Home Assistant
+instance and prints one JSON line per run, so results of different commits can be compared:
+
+    python benchmarks/bench_entities.py --devices 10 100 500 --scenario apply_scene
+    python benchmarks/bench_entities.py --devices 1000 5000 --scenario turn_on slider
+
+apply_scene sets every light with the service of the integration, turn_on sets all lights with one
+light.turn_on call and slider changes the brightness of 50 lights 20 times per second. call is how
+long the service call took and latency how long it took until the last universe of the change
+arrived at the sink, both from the start of the call. It needs `homeassistant` and `pyartnet`.
+
+With --batching off every light starts its fade as soon as it's turned on and renders its own
+target, as before the fade batch, which is the baseline the batching is compared against:
+
+    python benchmarks/bench_entities.py --devices 100 500 --scenario apply_scene turn_on --batching on off
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from homeassistant import config_entries  # noqa: E402
+from homeassistant.components.light import DOMAIN as LIGHT_DOMAIN  # noqa: E402
+from homeassistant.const import SERVICE_TURN_ON  # noqa: E402
+from homeassistant.core import HomeAssistant  # noqa: E402
+from homeassistant.helpers import area_registry, device_registry, entity, restore_state  # noqa: E402
+from homeassistant.setup import async_setup_component  # noqa: E402
+
+from bench_output import UdpSink, commit_id, measure_loop_lag, percentiles_ms  # noqa: E402
+from bench_startup import FIXTURES_PER_UNIVERSE, create_hass, make_config  # noqa: E402
+from custom_components.artnet_led import light  # noqa: E402
+
+# The fixtures are rgbww, the lights take the attributes of apply_scene as they are
+COLORS = ((255, 0, 0, 0, 0), (0, 255, 0, 0, 0), (0, 0, 255, 0, 0), (0, 0, 0, 255, 255))
+SLIDER_LIGHTS = 50
+
+
+class UnbatchedFades(light.FadeBatch):
+    """Starts every fade right away and renders every light on its own, as the lights did before the batch"""
+
+    def add(self, fading_light, transition, values=None, easing=None):
+        self._pending[fading_light] = (transition, values, easing)
+        self.commit()
+
+    def hold(self):
+        pass
+
+    def release(self):
+        pass
+
+
+async def setup_platform(config_dir: str, configs: list[dict]) -> HomeAssistant:
+    """Set up the light platform with the given platform configs in a bare Home Assistant instance"""
+    hass = await create_hass(config_dir)
+    hass.config.skip_pip = True
+    hass.config_entries = config_entries.ConfigEntries(hass, {})
+    entity.async_setup(hass)
+    await hass.config_entries.async_initialize()
+    await area_registry.async_load(hass)
+    await device_registry.async_load(hass)
+    await restore_state.async_load(hass)
+
+    assert await async_setup_component(hass, "light", {"light": configs})
+    await hass.async_start()
+    await hass.async_block_till_done()
+    return hass
+
+
+async def setup_lights(config_dir: str, devices: int, port: int) -> HomeAssistant:
+    config = make_config(devices, port)
+    config.update({"max_fps": 40, "refresh_every": 0})
+    return await setup_platform(config_dir, [config])
+
+
+async def run_scenario(hass: HomeAssistant, scenario: str, entity_ids: list[str], step: int):
+    color = COLORS[step % len(COLORS)]
+    if scenario == "apply_scene":
+        # every light gets its own attributes, as a scene does
+        await hass.services.async_call(light.INTEGRATION_DOMAIN, light.SERVICE_APPLY_SCENE, {
+            "entities": {entity_id: {"rgbww_color": color, "brightness": 255} for entity_id in entity_ids},
+            "transition": 0,
+        }, blocking=True)
+    elif scenario == "turn_on":
+        # one call for all lights, as a light group or an automation does
+        await hass.services.async_call(LIGHT_DOMAIN, SERVICE_TURN_ON, {
+            "entity_id": entity_ids, "rgbww_color": color, "brightness": 255, "transition": 0,
+        }, blocking=True)
+    elif scenario == "slider":
+        # the brightness slider of a group of lights is dragged
+        await hass.services.async_call(LIGHT_DOMAIN, SERVICE_TURN_ON, {
+            "entity_id": entity_ids[:SLIDER_LIGHTS], "brightness": 5 + step * 10 % 250,
+        }, blocking=True)
+    else:
+        raise ValueError(f"Unknown scenario {scenario}")
+
+
+async def wait_for_sink(sink: UdpSink, timeout: float = 2):
+    deadline = time.perf_counter() + timeout
+    while sink.marked_at is not None and time.perf_counter() < deadline:
+        await asyncio.sleep(0.005)
+
+
+async def benchmark(scenario: str, devices: int, repeat: int, batching: bool = True) -> dict:
+    loop = asyncio.get_running_loop()
+    transport, sink = await loop.create_datagram_endpoint(UdpSink, local_addr=("127.0.0.1", 0))
+    port = transport.get_extra_info("sockname")[1]
+    universes = -(-devices // FIXTURES_PER_UNIVERSE)
+
+    # The slider changes the lights of one universe 20 times per second
+    if scenario == "slider":
+        changed = -(-min(devices, SLIDER_LIGHTS) // FIXTURES_PER_UNIVERSE)
+        interval = 0.05
+    else:
+        changed = universes
+        interval = 0.1
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = await setup_lights(config_dir, devices, port)
+        if not batching:
+            hass.data[light.INTEGRATION_DOMAIN][light.DATA_FADE_BATCH].__class__ = UnbatchedFades
+        entity_ids = hass.states.async_entity_ids("light")
+
+        lag = []
+        lag_task = asyncio.create_task(measure_loop_lag(lag))
+        cpu_start = time.process_time()
+        wall_start = time.perf_counter()
+
+        calls = []
+        for step in range(repeat):
+            await asyncio.sleep(interval)
+            sink.mark(changed)
+            start = time.perf_counter()
+            await run_scenario(hass, scenario, entity_ids, step)
+            calls.append(time.perf_counter() - start)
+            # A slider doesn't wait, everything else is measured one change at a time
+            if scenario != "slider":
+                await wait_for_sink(sink)
+        await asyncio.sleep(0.1)
+
+        wall = time.perf_counter() - wall_start
+        cpu = time.process_time() - cpu_start
+        lag_task.cancel()
+        await hass.async_stop(force=True)
+    transport.close()
+
+    return {
+        "scenario": scenario,
+        "batching": batching,
+        "devices": devices,
+        "entities": len(entity_ids),
+        "universes": universes,
+        "cpu_percent": round(cpu / wall * 100, 2),
+        "packets_per_sec": round(sink.packets / wall, 1),
+        **percentiles_ms(lag, "loop_lag"),
+        **percentiles_ms(calls, "call"),
+        **percentiles_ms(sink.latencies, "latency"),
+        "lost": repeat - len(sink.latencies),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--devices", type=int, nargs="+", default=[10, 100, 500])
+    parser.add_argument("--scenario", nargs="+", default=["apply_scene", "turn_on", "slider"])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--batching", nargs="+", choices=("on", "off"), default=["on"],
+                        help="off starts every fade on its own, as a baseline for the fade batch")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    commit = commit_id()
+    for batching in args.batching:
+        for scenario in args.scenario:
+            for devices in args.devices:
+                result = asyncio.run(benchmark(scenario, devices, args.repeat, batching == "on"))
+                result["commit"] = commit
+                print(json.dumps(result), flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Benchmark of the input path: an ArtNetReceiver taking over the frames of a lighting desk.
+
+Replays ArtDmx packets for synthetic installs to a local receiver and prints one JSON line per run,
+so results of different commits can be compared:
+
+    python benchmarks/bench_input.py --universes 8 32 --fps 44 --scenario static fade
+
+In the static scenario the desk keeps sending the same frame, in the fade scenario every value
+changes with every frame. The replayer runs in the same process, its cost is part of cpu_percent.
+It needs `pyartnet` but not Home Assistant.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import socket
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bench_output import build_install, commit_id, measure_loop_lag  # noqa: E402
+from custom_components.artnet_led.output import ArtNetOutputNode, DMX_SLOTS, OutputChannel  # noqa: E402
+from custom_components.artnet_led.receiver import ArtNetReceiver  # noqa: E402
+
+# Different frames the fade scenario cycles through
+FADE_FRAMES = 64
+
+
+def artdmx_packet(universe: int, data: bytes) -> bytes:
+    return b"Art-Net\x00\x00\x50\x00\x0e\x00\x00" + bytes([
+        universe & 0xFF, universe >> 8, len(data) >> 8, len(data) & 0xFF
+    ]) + data
+
+
+def build_frames(scenario: str, universes: int) -> list[list[bytes]]:
+    """Return the packets of every frame the desk sends, one per universe"""
+    if scenario == "static":
+        return [[artdmx_packet(nr, bytes(range(256)) * 2) for nr in range(universes)]]
+    if scenario == "fade":
+        return [
+            [artdmx_packet(nr, bytes((step * 4 + k) & 0xFF for k in range(DMX_SLOTS))) for nr in range(universes)]
+            for step in range(FADE_FRAMES)
+        ]
+    raise ValueError(f"Unknown scenario {scenario}")
+
+
+async def replay(frames: list[list[bytes]], port: int, fps: int, duration: float) -> int:
+    """Send the frames like a desk does, at a fixed rate. Return the number of packets sent."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.setblocking(False)
+    sent = 0
+    step = 0
+    next_tick = time.monotonic()
+    end = next_tick + duration
+    while next_tick < end:
+        for packet in frames[step % len(frames)]:
+            sock.sendto(packet, ("127.0.0.1", port))
+            sent += 1
+        step += 1
+        next_tick += 1 / fps
+        await asyncio.sleep(max(0.0, next_tick - time.monotonic()))
+    sock.close()
+    return sent
+
+
+async def benchmark(scenario: str, universes: int, fps: int, duration: float) -> dict:
+    receiver = ArtNetReceiver(0, "127.0.0.1")
+    await receiver.start()
+    port = receiver._transport.get_extra_info("sockname")[1]
+
+    # The node isn't started, only its universes are needed
+    node = ArtNetOutputNode("127.0.0.1", 9, refresh_every=0)
+    channels = build_install(node, universes, OutputChannel)
+    for nr in range(universes):
+        receiver.add_universe(nr, node.get_universe(nr))
+
+    # Like the state publisher, changed channels are only collected
+    changed = set()
+    for channel in channels:
+        channel.callback_values_received = changed.add
+
+    frames = build_frames(scenario, universes)
+    lag = []
+    lag_task = asyncio.create_task(measure_loop_lag(lag))
+
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    sent = await replay(frames, port, fps, duration)
+    await asyncio.sleep(0.1)
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+
+    lag_task.cancel()
+    await receiver.stop()
+
+    lag.sort()
+    return {
+        "scenario": scenario,
+        "universes": universes,
+        "fixtures": len(channels),
+        "fps": fps,
+        "cpu_percent": round(cpu / wall * 100, 2),
+        "packets_sent": sent,
+        "packets_received": receiver.packets_received,
+        "channels_changed": len(changed),
+        "loop_lag_p50_ms": round(lag[len(lag) // 2] * 1000, 3) if lag else None,
+        "loop_lag_max_ms": round(lag[-1] * 1000, 3) if lag else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--universes", type=int, nargs="+", default=[8, 32])
+    parser.add_argument("--scenario", nargs="+", default=["static", "fade"])
+    parser.add_argument("--fps", type=int, default=44)
+    parser.add_argument("--duration", type=float, default=5)
+    args = parser.parse_args()
+
+    commit = commit_id()
+    for scenario in args.scenario:
+        for universes in args.universes:
+            result = asyncio.run(benchmark(scenario, universes, args.fps, args.duration))
+            result["commit"] = commit
+            print(json.dumps(result), flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark of the memory a light takes: its entity, the fixture state and the output channel.
+
+Sets up synthetic installs of the given sizes like bench_startup.py and traces the memory allocated
+by the setup of the platform, which is what stays allocated per fixture. Prints one JSON line per run,
+so results of different commits can be compared:
+
+    python benchmarks/bench_memory.py --devices 1000 5000
+
+The largest allocations are printed with --top. It needs `homeassistant` and `pyartnet`.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import gc
+import json
+import logging
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bench_output import commit_id  # noqa: E402
+from bench_startup import create_hass, make_config, register_entities  # noqa: E402
+from custom_components.artnet_led import light  # noqa: E402
+
+
+async def benchmark(devices: int, top: int) -> dict:
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = await create_hass(config_dir)
+        register_entities(hass, make_config(devices, 6454))
+        config = light.PLATFORM_SCHEMA(make_config(devices, 6454))
+
+        gc.collect()
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+
+        entities = []
+        await light.async_setup_platform(hass, config, entities.extend)
+
+        gc.collect()
+        after = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+
+        stats = after.compare_to(before, "lineno")
+        allocated = sum(stat.size_diff for stat in stats)
+        for stat in stats[:top]:
+            print(stat, file=sys.stderr)
+
+        await hass.data[light.INTEGRATION_DOMAIN][light.DATA_NODES].async_stop_all()
+        await hass.async_stop(force=True)
+
+    return {
+        "devices": devices,
+        "entities": len(entities),
+        "allocated_kb": round(allocated / 1024),
+        "bytes_per_fixture": round(allocated / devices),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--devices", type=int, nargs="+", default=[1000, 5000])
+    parser.add_argument("--top", type=int, default=0, help="print the largest allocations to stderr")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    commit = commit_id()
+    for devices in args.devices:
+        result = asyncio.run(benchmark(devices, args.top))
+        result["commit"] = commit
+        print(json.dumps(result), flush=True)
+
+
+if __name__ == "__main__":
+    main()
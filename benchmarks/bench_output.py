@@ -0,0 +1,411 @@
+"""
+Benchmark of the output path: fade engine, frame buffers and the transport of Art-Net or sACN.
+
+Runs synthetic installs against a local UDP sink and prints one JSON line per run,
+so results of different commits can be compared:
+
+    python benchmarks/bench_output.py --universes 1 8 32 --scenario scene slider long_fade
+
+The random targets of the scene scenario come from --seed, 0 by default, so every run fades to the
+same values; the seed is part of the output.
+
+The effect scenario fills every universe with one RGB pixel strip of 170 pixels and runs the
+effect given by --effect over all of them. With --protocol sacn the node sends E1.31 packets
+unicast to the sink, its universes start at 1:
+
+    python benchmarks/bench_output.py --universes 32 --scenario long_fade --protocol artnet sacn
+
+Besides packets per second, each run reports the tick jitter of the output loop of the node and
+the frame jitter seen by the sink, how far the time between two frames is off the frame time.
+
+The sink also measures how far apart the universes of a frame arrive. With --sync the node sends
+an ArtSync after each burst; nodes latch all universes when it arrives, the spread of the arrival
+then doesn't show and sync_delay is how long after the last universe the ArtSync came:
+
+    python benchmarks/bench_output.py --universes 32 --scenario long_fade --sync off on
+
+With --engine pyartnet the same scenarios run on the node of pyartnet the integration used before,
+with its own socket, send loop and LinearFade objects. send is how long handing the universes of
+a tick to the socket took:
+
+    python benchmarks/bench_output.py --universes 32 --fps 50 --scenario long_fade --engine pyartnet output
+
+all_off fades every fixture from full to off over --duration seconds, as turning a whole house off
+with a transition does. fade_ms_per_frame is how long processing the fades of all universes took
+per frame, fade_frames_per_cpu_sec how many frames one core could process at that cost:
+
+    python benchmarks/bench_output.py --universes 3 --scenario all_off --engine pyartnet output
+
+The slider scenario moves 50 fixtures 20 times per second. After the timed run it traces the memory
+one such update and the frame after it allocate, which shows whether updates create new objects:
+
+    python benchmarks/bench_output.py --universes 1 --scenario slider --engine pyartnet output
+
+Effects are rendered by the output loop, so they have a CPU budget: --budget percent of one core on a
+device --slowdown times slower than this one, by default half a core of a Raspberry Pi 4. Effect runs
+report target_cpu_percent and within_budget, and the benchmark exits with 1 if one of them is over it:
+
+    python benchmarks/bench_output.py --universes 10 --scenario effect --effect fire --budget 50 --slowdown 5
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pyartnet  # noqa: E402
+
+from custom_components.artnet_led.effects import EFFECTS, EffectRenderer  # noqa: E402
+from custom_components.artnet_led.output import (  # noqa: E402
+    ARTSYNC_PACKET, OUTPUT_PROTOCOLS, OutputChannel, OutputChannel16Bit, OutputNode
+)
+
+ENGINES = ("output", "pyartnet")
+FIXTURE_WIDTH = 5  # rgbww
+STRIP_PIXELS = 170  # rgb
+
+
+class UdpSink(asyncio.DatagramProtocol):
+    """
+    Counts the received packets and remembers when the given number of packets after a mark arrived.
+    Packets are grouped into frames, a frame ends with an ArtSync or when a universe of it arrives again.
+    The time between the starts of two frames is kept, how far it is off the frame time is the jitter.
+    """
+
+    def __init__(self):
+        self.packets = 0
+        self.bytes = 0
+        self.marked_at = None
+        self.awaited = 0
+        self.latencies = []
+        self.spreads = []
+        self.sync_delays = []
+        self.intervals = []
+        self._frame = set()
+        self._first = self._last = 0.0
+
+    def datagram_received(self, data: bytes, addr):
+        now = time.perf_counter()
+        self.packets += 1
+        self.bytes += len(data)
+        is_sync = data.startswith(ARTSYNC_PACKET[:10])
+        if self.marked_at is not None and not is_sync:
+            self.awaited -= 1
+            if self.awaited <= 0:
+                self.latencies.append(now - self.marked_at)
+                self.marked_at = None
+
+        if is_sync:
+            if self._frame:
+                self.sync_delays.append(now - self._last)
+                self.end_frame()
+            return None
+
+        universe = data[14:16] if data.startswith(b"Art-Net") else data[113:115]
+        if universe in self._frame:
+            self.end_frame()
+        if not self._frame:
+            if self._first:
+                self.intervals.append(now - self._first)
+            self._first = now
+        self._frame.add(universe)
+        self._last = now
+
+    def end_frame(self):
+        if len(self._frame) > 1:
+            self.spreads.append(self._last - self._first)
+        self._frame.clear()
+
+    def mark(self, packets: int = 1):
+        self.marked_at = time.perf_counter()
+        self.awaited = packets
+
+
+async def measure_loop_lag(samples: list, interval: float = 0.01):
+    """Measure how late the event loop wakes up a task"""
+    while True:
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        samples.append(time.perf_counter() - start - interval)
+
+
+def build_install(node: OutputNode, universes: int, channel_type: type[OutputChannel], first: int = 0) -> list:
+    channels = []
+    fixtures = 512 // (FIXTURE_WIDTH * channel_type._CHANNEL_SIZE)
+    for nr in range(first, first + universes):
+        universe = node.add_universe(nr)
+        for k in range(fixtures):
+            start = 1 + k * FIXTURE_WIDTH * channel_type._CHANNEL_SIZE
+            channels.append(universe.add_channel(start, FIXTURE_WIDTH, channel_type=channel_type))
+    return channels
+
+
+def build_strips(node: OutputNode, universes: int, channel_type: type[OutputChannel], first: int = 0) -> list:
+    pixels = 512 // (3 * channel_type._CHANNEL_SIZE)
+    return [
+        node.add_universe(nr).add_channel(1, 3 * min(pixels, STRIP_PIXELS), channel_type=channel_type)
+        for nr in range(first, first + universes)
+    ]
+
+
+async def run_scenario(scenario: str, channels: list, sink: UdpSink, duration: float, effect: str, seed: int):
+    max_val = channels[0]._CHANNEL_MAX
+    end = time.perf_counter() + duration
+
+    if scenario == "effect":
+        # one effect over all strips, as the apply_effect service runs it
+        effect = EFFECTS[effect]
+        scale = max_val / 255
+        palette = [[round(c * scale) for c in color] for color in effect.palette((255, 80, 0))]
+        start = time.monotonic()
+        for nr, channel in enumerate(channels):
+            pixels = channel.width // 3
+            channel.set_effect(EffectRenderer(effect, palette, pixels, start, nr / len(channels), 1 / len(channels)))
+        await asyncio.sleep(duration)
+    elif scenario == "scene":
+        # everything changes at once every second, the same targets in every run
+        rng = random.Random(seed)
+        while time.perf_counter() < end:
+            target = [rng.randint(0, max_val) for _ in range(FIXTURE_WIDTH)]
+            sink.mark()
+            for channel in channels:
+                channel.add_fade(target, 500)
+            await asyncio.sleep(1)
+    elif scenario == "slider":
+        # 20 updates per second on the first 50 fixtures
+        dragged = channels[:50]
+        value = 0
+        while time.perf_counter() < end:
+            value = (value + max_val // 40) % max_val
+            sink.mark()
+            for channel in dragged:
+                channel.add_fade([value] * FIXTURE_WIDTH, 200)
+            await asyncio.sleep(0.05)
+    elif scenario == "all_off":
+        # the whole house is turned off with a transition
+        for channel in channels:
+            channel.add_fade([max_val] * FIXTURE_WIDTH, 0)
+        await asyncio.sleep(0.1)
+        sink.mark()
+        for channel in channels:
+            channel.add_fade([0] * FIXTURE_WIDTH, duration * 1000)
+        await asyncio.sleep(duration)
+    elif scenario == "long_fade":
+        sink.mark()
+        for channel in channels:
+            channel.add_fade([max_val] * FIXTURE_WIDTH, duration * 1000)
+        await asyncio.sleep(duration)
+    else:
+        raise ValueError(f"Unknown scenario {scenario}")
+
+
+def frame_jitter(intervals: list, frame_time: float) -> list:
+    """
+    How far the frame intervals are off the frame time. Frames in which nothing changed aren't sent,
+    so an interval is compared with the nearest multiple of the frame time.
+    """
+    return [abs(interval - max(1, round(interval / frame_time)) * frame_time) for interval in intervals]
+
+
+def slider_allocations(channels: list, universes: list, updates: int = 100) -> dict:
+    """
+    Memory allocated by one slider update of 50 fixtures and the frame after it, traced by tracemalloc
+    outside of the timed run. peak is what the update allocates at most, kept what stays allocated.
+    """
+    dragged = channels[:50]
+    max_val = channels[0]._CHANNEL_MAX
+    peaks = []
+    kept = []
+
+    tracemalloc.start()
+    for k in range(updates):
+        value = k * max_val // updates
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        for channel in dragged:
+            channel.add_fade([value] * FIXTURE_WIDTH, 200)
+        for universe in universes:
+            universe.process()
+        current, peak = tracemalloc.get_traced_memory()
+        peaks.append(peak - before)
+        kept.append(current - before)
+    tracemalloc.stop()
+
+    peaks.sort()
+    return {
+        "alloc_peak_bytes_per_update": peaks[len(peaks) // 2],
+        "alloc_kept_bytes_per_update": round(sum(kept) / len(kept)),
+    }
+
+
+def fade_headroom(fade_times: list, universes: int) -> dict:
+    """Time the fades of a frame took, and how many frames per second of CPU time that would allow"""
+    frames = len(fade_times) // universes
+    total = sum(fade_times)
+    return {
+        "fade_ms_per_frame": round(total / frames * 1000, 3) if frames else None,
+        "fade_frames_per_cpu_sec": round(frames / total) if total else None,
+    }
+
+
+def percentiles_ms(samples: list, name: str) -> dict:
+    samples = sorted(samples)
+    return {
+        f"{name}_p50_ms": round(samples[len(samples) // 2] * 1000, 3) if samples else None,
+        f"{name}_max_ms": round(samples[-1] * 1000, 3) if samples else None,
+    }
+
+
+def time_calls(function: Callable, samples: list) -> Callable:
+    def timed(*args):
+        start = time.perf_counter()
+        result = function(*args)
+        samples.append(time.perf_counter() - start)
+        return result
+    return timed
+
+
+async def benchmark(scenario: str, universes: int, fps: int, duration: float, bits: int, effect: str,
+                    protocol: str = "artnet", sync: bool = False, engine: str = "output", seed: int = 0) -> dict:
+    loop = asyncio.get_running_loop()
+    transport, sink = await loop.create_datagram_endpoint(UdpSink, local_addr=("127.0.0.1", 0))
+    port = transport.get_extra_info("sockname")[1]
+
+    # Every call that hands the universes of a tick to the socket is timed
+    sends = []
+    if engine == "pyartnet":
+        # The node of pyartnet as the integration used it before: its socket, its loop and LinearFade
+        node = pyartnet.ArtNetNode("127.0.0.1", port, max_fps=fps, refresh_every=0)
+        node.update = time_calls(node.update, sends)
+        channel_type = pyartnet.DmxChannel16Bit if bits == 16 else pyartnet.DmxChannel
+    else:
+        # ArtSync only exists in Art-Net, the sACN node has no sync option
+        if sync and protocol != "artnet":
+            raise ValueError(f"sync is Art-Net only, not {protocol}")
+        options = {"sync": sync} if protocol == "artnet" else {}
+        node = OUTPUT_PROTOCOLS[protocol]("127.0.0.1", port, max_fps=fps, refresh_every=0, **options)
+        node._send = time_calls(node._send, sends)
+        channel_type = OutputChannel16Bit if bits == 16 else OutputChannel
+    build = build_strips if scenario == "effect" else build_install
+    first = 1 if protocol == "sacn" else 0
+    channels = build(node, universes, channel_type, first)
+
+    # The fades of all universes are processed once per frame
+    fade_times = []
+    universe_list = [node.get_universe(nr) for nr in range(first, first + universes)]
+    for universe in universe_list:
+        universe.process = time_calls(universe.process, fade_times)
+
+    lag = []
+    lag_task = asyncio.create_task(measure_loop_lag(lag))
+    await node.start()
+
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    await run_scenario(scenario, channels, sink, duration, effect, seed)
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+
+    await node.stop()
+    lag_task.cancel()
+    transport.close()
+
+    sink.end_frame()
+    stats = getattr(node, "stats", None)
+    headroom = fade_headroom(fade_times, universes)
+    for universe in universe_list:
+        del universe.process
+    allocations = slider_allocations(channels, universe_list) if scenario == "slider" else {}
+    return {
+        "scenario": f"effect {effect}" if scenario == "effect" else scenario,
+        "engine": engine,
+        "protocol": protocol,
+        "sync": sync,
+        "universes": universes,
+        "fixtures": len(channels),
+        "fps": fps,
+        "bits": bits,
+        "seed": seed,
+        "cpu_percent": round(cpu / wall * 100, 2),
+        "packets_per_sec": round(sink.packets / wall, 1),
+        "bytes_per_sec": round(sink.bytes / wall),
+        **percentiles_ms(lag, "loop_lag"),
+        **percentiles_ms(sink.latencies, "latency"),
+        **percentiles_ms(sink.spreads, "arrival_spread"),
+        **percentiles_ms(sink.sync_delays, "sync_delay"),
+        **percentiles_ms(frame_jitter(sink.intervals, node.sleep_time), "frame_jitter"),
+        **percentiles_ms(sends, "send"),
+        **headroom,
+        **allocations,
+        "tick_jitter_avg_ms": round(stats.jitter_total / max(stats.ticks, 1) * 1000, 3) if stats else None,
+        "tick_jitter_max_ms": round(stats.jitter_max * 1000, 3) if stats else None,
+        "burst_max_ms": round(stats.burst_max * 1000, 3) if stats else None,
+    }
+
+
+def effect_budget(cpu_percent: float, budget: float, slowdown: float) -> dict:
+    target = cpu_percent * slowdown
+    return {"target_cpu_percent": round(target, 2), "within_budget": target <= budget}
+
+
+def commit_id() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--universes", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--scenario", nargs="+", default=["scene", "slider", "long_fade"])
+    parser.add_argument("--fps", type=int, default=40)
+    parser.add_argument("--bits", type=int, choices=(8, 16), default=8)
+    parser.add_argument("--duration", type=float, default=5)
+    parser.add_argument("--effect", choices=list(EFFECTS), default="rainbow")
+    parser.add_argument("--protocol", nargs="+", choices=list(OUTPUT_PROTOCOLS), default=["artnet"])
+    parser.add_argument("--sync", nargs="+", choices=("off", "on"), default=["off"], help="ArtSync, Art-Net only")
+    parser.add_argument("--engine", nargs="+", choices=ENGINES, default=["output"],
+                        help="output of the integration, or the node of pyartnet for comparison")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the random targets of the scene scenario")
+    parser.add_argument("--budget", type=float, default=50, help="percent of one core effects may take")
+    parser.add_argument("--slowdown", type=float, default=5, help="how much slower the target device is")
+    args = parser.parse_args()
+
+    commit = commit_id()
+    over_budget = False
+    for engine in args.engine:
+        for protocol in args.protocol:
+            for sync in args.sync:
+                for scenario in args.scenario:
+                    if engine == "pyartnet" and (protocol != "artnet" or sync == "on" or scenario == "effect"):
+                        print(f"Skipping {scenario} {protocol} sync {sync}, pyartnet only sends Art-Net "
+                              f"without sync or effects", file=sys.stderr)
+                        continue
+                    if protocol != "artnet" and sync == "on":
+                        print(f"Skipping {scenario} {protocol} sync on, ArtSync is Art-Net only", file=sys.stderr)
+                        continue
+                    for universes in args.universes:
+                        result = asyncio.run(benchmark(
+                            scenario, universes, args.fps, args.duration, args.bits, args.effect, protocol,
+                            sync == "on", engine, args.seed
+                        ))
+                        if scenario == "effect":
+                            result.update(effect_budget(result["cpu_percent"], args.budget, args.slowdown))
+                            over_budget |= not result["within_budget"]
+                        result["commit"] = commit
+                        print(json.dumps(result), flush=True)
+    sys.exit(1 if over_budget else 0)
+
+
+if __name__ == "__main__":
+    main()
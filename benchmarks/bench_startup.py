@@ -0,0 +1,116 @@
+"""
+Benchmark of the setup of the light platform: config validation, node setup and creating the entities.
+
+Sets up synthetic installs of the given sizes in a bare Home Assistant instance and prints one
+JSON line per run, so results of different commits can be compared. Unless --fresh is given, the
+entities are in the entity registry already, as they are on every restart of Home Assistant:
+
+    python benchmarks/bench_startup.py --devices 100 1000 5000
+
+The entities are created but not added to Home Assistant, so this measures the integration and
+not the entity platform of Home Assistant. It needs `homeassistant` and `pyartnet`.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from homeassistant.core import HomeAssistant  # noqa: E402
+from homeassistant.helpers import entity_registry  # noqa: E402
+
+from bench_output import commit_id  # noqa: E402
+from custom_components.artnet_led import light  # noqa: E402
+
+FIXTURE_WIDTH = 5  # rgbww
+FIXTURES_PER_UNIVERSE = 512 // FIXTURE_WIDTH
+
+
+def make_config(devices: int, port: int) -> dict:
+    universes = {}
+    for i in range(devices):
+        universe = universes.setdefault(i // FIXTURES_PER_UNIVERSE, {"devices": []})
+        universe["devices"].append({
+            "channel": i % FIXTURES_PER_UNIVERSE * FIXTURE_WIDTH + 1,
+            "name": f"bench {i}",
+            "type": "rgbww",
+        })
+    return {
+        "platform": "artnet_led",
+        "host": "127.0.0.1",
+        "port": port,
+        "diagnostics": False,
+        "universes": universes,
+    }
+
+
+async def create_hass(config_dir: str) -> HomeAssistant:
+    try:
+        hass = HomeAssistant(config_dir)
+    except TypeError:
+        hass = HomeAssistant()
+        hass.config.config_dir = config_dir
+    await entity_registry.async_load(hass)
+    return hass
+
+
+def register_entities(hass: HomeAssistant, config: dict):
+    registry = entity_registry.async_get(hass)
+    for universe_nr, universe in config["universes"].items():
+        for device in universe["devices"]:
+            registry.async_get_or_create(
+                "light", light.INTEGRATION_DOMAIN, f"{light.DOMAIN}:{config['host']}/{universe_nr}/{device['channel']}",
+                suggested_object_id=device["name"].replace(" ", "_").lower(),
+            )
+
+
+async def benchmark(devices: int, fresh: bool) -> dict:
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = await create_hass(config_dir)
+        if not fresh:
+            register_entities(hass, make_config(devices, 6454))
+
+        start = time.perf_counter()
+        config = light.PLATFORM_SCHEMA(make_config(devices, 6454))
+        validated = time.perf_counter()
+
+        entities = []
+        await light.async_setup_platform(hass, config, entities.extend)
+        done = time.perf_counter()
+
+        await hass.data[light.INTEGRATION_DOMAIN][light.DATA_NODES].async_stop_all()
+        await hass.async_stop(force=True)
+
+    return {
+        "devices": devices,
+        "registered": not fresh,
+        "entities": len(entities),
+        "validate_ms": round((validated - start) * 1000, 1),
+        "setup_ms": round((done - validated) * 1000, 1),
+        "per_device_us": round((done - validated) / devices * 1_000_000, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--devices", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--fresh", action="store_true", help="start with an empty entity registry")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    commit = commit_id()
+    for devices in args.devices:
+        result = asyncio.run(benchmark(devices, args.fresh))
+        result["commit"] = commit
+        print(json.dumps(result), flush=True)
+
+
+if __name__ == "__main__":
+    main()
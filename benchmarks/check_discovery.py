@@ -0,0 +1,134 @@
+"""
+Check of the Art-Net discovery against a fake node on loopback, for changes of discovery.py.
+
+The fake node answers every ArtPoll with an ArtPollReply for the short name FAKE whose outputs are
+patched to universes 0 and 1. Two nodes are set up: one by node_name and one with the directed
+broadcast address 127.255.255.255 and `broadcast: true`. The check verifies that
+
+- the broadcast host polls the fake node and its reply is cached,
+- the named node and universe 1 switch from broadcast to the address of the fake node,
+- universe 5, which no node outputs, stays broadcast,
+- the destinations fall back to broadcast once the fake node stops answering.
+
+It prints one line per step and exits with 1 if a step failed:
+
+    python benchmarks/check_discovery.py
+
+It needs `homeassistant` and `pyartnet`.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bench_entities import setup_platform  # noqa: E402
+from custom_components.artnet_led import light  # noqa: E402
+from custom_components.artnet_led.discovery import ARTNET_PORT, POLL_INTERVAL  # noqa: E402
+
+BROADCAST = "127.255.255.255"
+OP_POLL = b"\x00\x20"
+OP_DMX = b"\x00\x50"
+
+
+def poll_reply(ip: list[int], short_name: str, universes: list[int]) -> bytes:
+    """Return an ArtPollReply of a node at ip whose output ports are patched to the universes of net 0, subnet 0"""
+    data = bytearray(239)
+    data[0:10] = b"Art-Net\x00\x00\x21"
+    data[10:14] = bytes(ip)
+    data[14:16] = ARTNET_PORT.to_bytes(2, "little")
+    data[23] = 0xD0
+    data[26:26 + len(short_name)] = short_name.encode()
+    data[44:53] = b"Fake node"
+    data[172:174] = len(universes).to_bytes(2, "big")
+    for port, universe in enumerate(universes):
+        data[174 + port] = 0x80
+        data[182 + port] = 0x80
+        data[190 + port] = universe
+    return bytes(data)
+
+
+class FakeNode(asyncio.DatagramProtocol):
+    def __init__(self):
+        self.transport = None
+        self.polls = 0
+        self.universes = set()
+        self.answer = True
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data: bytes, addr):
+        opcode = data[8:10]
+        if opcode == OP_POLL:
+            self.polls += 1
+            if self.answer:
+                self.transport.sendto(poll_reply([127, 0, 0, 1], "FAKE", [0, 1]), addr)
+        elif opcode == OP_DMX:
+            self.universes.add(data[14])
+
+
+def check(results: list, name: str, ok: bool, detail):
+    results.append(ok)
+    print(f"{'ok  ' if ok else 'FAIL'} {name}: {detail}", flush=True)
+
+
+async def main() -> bool:
+    loop = asyncio.get_running_loop()
+    transport, fake = await loop.create_datagram_endpoint(
+        FakeNode, local_addr=("0.0.0.0", 0), allow_broadcast=True
+    )
+    port = transport.get_extra_info("sockname")[1]
+    fake_address = ("127.0.0.1", port)
+
+    def dimmer(name):
+        return {"devices": [{"channel": 1, "name": name, "type": "dimmer"}]}
+
+    configs = [
+        {"platform": "artnet_led", "node_name": "FAKE", "port": port, "universes": {0: dimmer("named")}},
+        {"platform": "artnet_led", "host": BROADCAST, "broadcast": True, "port": port,
+         "universes": {1: dimmer("claimed"), 5: dimmer("unclaimed")}},
+    ]
+
+    results = []
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = await setup_platform(config_dir, configs)
+        manager = hass.data[light.INTEGRATION_DOMAIN][light.DATA_NODES]
+        named = manager.get_node(manager.node_id("FAKE", port))
+        broadcast = manager.get_node(manager.node_id(BROADCAST, port))
+
+        await asyncio.sleep(0.3)
+        discovery = manager.discovery
+        check(results, "polled", fake.polls > 0 and discovery.replies_received > 0,
+              f"{fake.polls} polls, {discovery.replies_received} replies, nodes {discovery.nodes}")
+        check(results, "named node", named.get_destinations(0) == (fake_address,), named.get_destinations(0))
+        check(results, "claimed universe", broadcast.get_destinations(1) == (fake_address,),
+              broadcast.get_destinations(1))
+        check(results, "unclaimed universe", broadcast.get_destinations(5) == ((BROADCAST, port),),
+              broadcast.get_destinations(5))
+
+        await hass.services.async_call("light", "turn_on", {
+            "entity_id": ["light.named", "light.claimed", "light.unclaimed"], "brightness": 200
+        }, blocking=True)
+        await asyncio.sleep(0.3)
+        check(results, "frames received", {0, 1, 5} <= fake.universes, sorted(fake.universes))
+
+        # Let the fake node go silent, the cache is cleaned up with the next poll
+        discovery._ttl = 1.0
+        fake.answer = False
+        await asyncio.sleep(POLL_INTERVAL)
+        check(results, "expired", broadcast.get_destinations(1) == ((BROADCAST, port),),
+              broadcast.get_destinations(1))
+
+        await hass.async_stop(force=True)
+    transport.close()
+    return all(results)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    sys.exit(0 if asyncio.run(main()) else 1)
@@ -0,0 +1,139 @@
+"""
+Check of the sACN output against a listener on loopback, for changes of the E1.31 packets of output.py.
+
+A SacnOutputNode sends two universes of 510 channels unicast to the listener while a fade runs, then
+holds the values for a few seconds. The check verifies that
+
+- every packet has the E1.31 layout: root, framing and DMP layer with their lengths, vectors,
+  source name, priority, preview flag, universe and start code,
+- the sequence number of every universe counts up by one,
+- the frames are sent at max_fps while the fade runs,
+- the unchanged universes are resent every refresh_every seconds, well within the 2.5s after which
+  receivers drop a source,
+- the streams are terminated when the node stops.
+
+It prints one line per step and exits with 1 if a step failed:
+
+    python benchmarks/check_sacn.py --refresh-every 1
+
+It needs `pyartnet` but not Home Assistant.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import struct
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from custom_components.artnet_led.output import (  # noqa: E402
+    SACN_HEADER_SIZE, SACN_PREVIEW_DATA, SACN_STREAM_TERMINATED, SacnOutputNode
+)
+
+UNIVERSES = (1, 300)
+CHANNELS = 510
+PRIORITY = 150
+FADE_MS = 1000
+# Receivers consider a source lost after this many seconds without a packet
+DATA_LOSS_TIMEOUT = 2.5
+
+
+class SacnListener(asyncio.DatagramProtocol):
+    def __init__(self):
+        self.packets = []
+
+    def datagram_received(self, data: bytes, addr):
+        self.packets.append((time.monotonic(), data))
+
+
+def layout_errors(data: bytes, slots: int) -> list[str]:
+    """Return what doesn't match the E1.31 data packet layout"""
+    size = len(data)
+    expected = [
+        ("size", size, SACN_HEADER_SIZE + slots),
+        ("preamble", data[0:4], b"\x00\x10\x00\x00"),
+        ("packet identifier", data[4:16], b"ASC-E1.17\x00\x00\x00"),
+        ("root length", struct.unpack(">H", data[16:18])[0], 0x7000 | (size - 16)),
+        ("root vector", data[18:22], b"\x00\x00\x00\x04"),
+        ("framing length", struct.unpack(">H", data[38:40])[0], 0x7000 | (size - 38)),
+        ("framing vector", data[40:44], b"\x00\x00\x00\x02"),
+        ("source name", data[44:59], b"Home Assistant\x00"),
+        ("priority", data[108], PRIORITY),
+        ("sync address", data[109:111], b"\x00\x00"),
+        ("preview", data[112] & SACN_PREVIEW_DATA, SACN_PREVIEW_DATA),
+        ("DMP length", struct.unpack(">H", data[115:117])[0], 0x7000 | (size - 115)),
+        ("DMP vector", data[117:119], b"\x02\xa1"),
+        ("address", data[119:123], b"\x00\x00\x00\x01"),
+        ("property values", struct.unpack(">H", data[123:125])[0], slots + 1),
+        ("start code", data[125], 0),
+    ]
+    return [f"{name} {actual!r} != {value!r}" for name, actual, value in expected if actual != value]
+
+
+def check(results: list, name: str, ok: bool, detail):
+    results.append(ok)
+    print(f"{'ok  ' if ok else 'FAIL'} {name}: {detail}", flush=True)
+
+
+async def main(fps: int, refresh_every: float, hold: float) -> bool:
+    loop = asyncio.get_running_loop()
+    transport, listener = await loop.create_datagram_endpoint(SacnListener, local_addr=("127.0.0.1", 0))
+    port = transport.get_extra_info("sockname")[1]
+
+    node = SacnOutputNode("127.0.0.1", port, max_fps=fps, refresh_every=refresh_every,
+                          priority=PRIORITY, preview=True)
+    channels = [node.add_universe(nr).add_channel(1, CHANNELS) for nr in UNIVERSES]
+    await node.start()
+    fade_start = time.monotonic()
+    for channel in channels:
+        channel.add_fade([255] * CHANNELS, FADE_MS)
+    await asyncio.sleep(FADE_MS / 1000 + hold)
+    await node.stop()
+    await asyncio.sleep(0.05)
+    transport.close()
+
+    results = []
+    streams = defaultdict(list)
+    errors = []
+    for received, data in listener.packets:
+        universe = struct.unpack(">H", data[113:115])[0]
+        streams[universe].append((received, data))
+        errors.extend(f"universe {universe}: {error}" for error in layout_errors(data, CHANNELS))
+    check(results, "layout", not errors and len(listener.packets) > 0,
+          f"{len(listener.packets)} packets" if not errors else errors[:5])
+    check(results, "universes", sorted(streams) == list(UNIVERSES), sorted(streams))
+
+    fade_end = fade_start + FADE_MS / 1000
+    for universe, packets in sorted(streams.items()):
+        sequence = [data[111] for _, data in packets]
+        check(results, f"universe {universe} sequence",
+              all((b - a) & 0xFF == 1 for a, b in zip(sequence, sequence[1:])), f"{len(sequence)} numbers")
+
+        live = [received for received, data in packets if not data[112] & SACN_STREAM_TERMINATED]
+        fading = [received for received in live if received <= fade_end]
+        rate = (len(fading) - 1) / (fading[-1] - fading[0]) if len(fading) > 1 else 0
+        check(results, f"universe {universe} fade rate", rate >= fps * 0.9, f"{rate:.1f}/s at max_fps {fps}")
+
+        held = [received for received in live if received > fade_end]
+        gaps = [b - a for a, b in zip(held, held[1:])]
+        longest = max(gaps, default=hold)
+        check(results, f"universe {universe} refresh", len(held) > 1 and longest < min(
+            refresh_every + 0.5, DATA_LOSS_TIMEOUT
+        ), f"{len(held)} packets in {hold}s, longest gap {longest:.2f}s at refresh_every {refresh_every}")
+
+        terminated = [data for _, data in packets if data[112] & SACN_STREAM_TERMINATED]
+        check(results, f"universe {universe} terminated", len(terminated) > 0, f"{len(terminated)} packets")
+    return all(results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fps", type=int, default=40)
+    parser.add_argument("--refresh-every", type=float, default=1)
+    parser.add_argument("--hold", type=float, default=3, help="seconds the values are held after the fade")
+    args = parser.parse_args()
+    sys.exit(0 if asyncio.run(main(args.fps, args.refresh_every, args.hold)) else 1)
@@ -1 +1,8 @@
 """ARTNET LED"""
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.typing import ConfigType
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    # The lights are set up by their platform, loading the integration lets the recorder find recorder.py
+    return True
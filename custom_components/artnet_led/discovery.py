@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import time
+from typing import Callable
+
+from .receiver import ARTNET_ID, OP_POLL, ArtNetReceiver
+
+log = logging.getLogger(__name__)
+
+ARTNET_PORT = 6454
+ARTNET_BROADCAST = "255.255.255.255"
+
+# Controllers should poll every 2.5 to 3 seconds, a node which missed three polls is gone
+POLL_INTERVAL = 3.0
+NODE_TTL = 10.0
+
+# ArtPoll with protocol version 14, no flags and the lowest diagnostics priority
+ARTPOLL_PACKET = ARTNET_ID + OP_POLL + b"\x00\x0e\x00\x10"
+
+# Length of an ArtPollReply up to and including SwOut, older nodes don't send the fields after it
+POLL_REPLY_MIN_SIZE = 194
+POLL_REPLY_BIND_INDEX = 211
+
+
+class ArtNetNodeInfo:
+    """What an ArtPollReply tells about a node, or about one page of the ports of a node with more than four ports"""
+
+    __slots__ = ("ip", "bind_index", "short_name", "long_name", "report", "status", "universes", "last_seen")
+
+    def __init__(self, ip: str, bind_index: int, short_name: str, long_name: str, report: str, status: int,
+                 universes: frozenset[int], last_seen: float):
+        self.ip = ip
+        self.bind_index = bind_index
+        self.short_name = short_name
+        self.long_name = long_name
+        self.report = report
+        self.status = status
+        self.universes = universes
+        self.last_seen = last_seen
+
+    def same_as(self, other: ArtNetNodeInfo) -> bool:
+        """Return True if the other reply maps the same name and universes"""
+        return self.ip == other.ip and self.short_name == other.short_name and self.universes == other.universes
+
+    def __repr__(self):
+        return f"<ArtNetNodeInfo {self.short_name} {self.ip} universes {sorted(self.universes)}>"
+
+
+def is_broadcast(host: str) -> bool:
+    """
+    Return True for the limited broadcast address. Whether another address is the directed broadcast of a
+    subnet depends on its netmask, e.g. 10.0.1.255 is a host in a /16, so those are configured explicitly.
+    """
+    return host == ARTNET_BROADCAST
+
+
+def _text(data: bytes) -> str:
+    return data.split(b"\x00", 1)[0].decode("ascii", "replace").strip()
+
+
+def parse_poll_reply(data: bytes, now: float) -> ArtNetNodeInfo | None:
+    """Return the node described by an ArtPollReply packet, None if it is too short"""
+    if len(data) < POLL_REPLY_MIN_SIZE:
+        return None
+
+    # Port-Address of an output port: 7 bit net, 4 bit sub-net and 4 bit universe
+    net = (data[18] & 0x7F) << 8 | (data[19] & 0x0F) << 4
+    ports = min(data[172] << 8 | data[173], 4)
+    universes = frozenset(
+        net | data[190 + i] & 0x0F
+        for i in range(ports)
+        if data[174 + i] & 0x80  # Port can output DMX
+    )
+
+    return ArtNetNodeInfo(
+        ip=".".join(str(b) for b in data[10:14]),
+        bind_index=data[POLL_REPLY_BIND_INDEX] if len(data) > POLL_REPLY_BIND_INDEX else 0,
+        short_name=_text(data[26:44]),
+        long_name=_text(data[44:108]),
+        report=_text(data[108:172]),
+        status=data[23],
+        universes=universes,
+        last_seen=now,
+    )
+
+
+class ArtPollDiscovery:
+    """
+    Finds Art-Net nodes by broadcasting an ArtPoll every POLL_INTERVAL seconds through an ArtNetReceiver
+    and caches their ArtPollReply. Nodes which didn't reply for NODE_TTL seconds are dropped again.
+    Listeners are called whenever a node appeared, disappeared or changed its name or universes.
+    """
+
+    def __init__(self, receiver: ArtNetReceiver, interval: float = POLL_INTERVAL, ttl: float = NODE_TTL):
+        self._receiver = receiver
+        self._interval = interval
+        self._ttl = ttl
+        self._task: asyncio.Task | None = None
+        self._broadcasts: set[tuple[str, int]] = set()
+        self._listeners: list[Callable[[], None]] = []
+        self._nodes: dict[tuple[str, int], ArtNetNodeInfo] = {}
+        self.replies_received = 0
+
+    @property
+    def nodes(self) -> list[ArtNetNodeInfo]:
+        return list(self._nodes.values())
+
+    def add_broadcast(self, address: str, port: int = ARTNET_PORT):
+        """Also send the polls to this broadcast address"""
+        if (address, port) not in self._broadcasts:
+            self._broadcasts.add((address, port))
+            if self._task is not None:
+                self.poll()
+
+    def add_listener(self, listener: Callable[[], None]):
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[], None]):
+        with contextlib.suppress(ValueError):
+            self._listeners.remove(listener)
+
+    def find(self, short_name: str) -> str | None:
+        """Return the IP of the node with the given short name, None if it isn't known"""
+        short_name = short_name.casefold()
+        for info in self._nodes.values():
+            if info.short_name.casefold() == short_name:
+                return info.ip
+        return None
+
+    def resolve(self, universe: int) -> tuple[str, ...]:
+        """Return the IPs of all nodes which output the given universe (Port-Address)"""
+        return tuple(sorted({info.ip for info in self._nodes.values() if universe in info.universes}))
+
+    async def start(self):
+        if self._task is not None:
+            return None
+
+        self._receiver.poll_reply_handler = self.reply_received
+        self._task = asyncio.create_task(self._worker())
+
+    async def stop(self):
+        if self._task is None:
+            return None
+
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+        self._receiver.poll_reply_handler = None
+
+    def poll(self):
+        for address in self._broadcasts:
+            self._receiver.send(ARTPOLL_PACKET, address)
+
+    async def _worker(self):
+        while True:
+            self.expire(time.monotonic())
+            self.poll()
+            await asyncio.sleep(self._interval)
+
+    def reply_received(self, data: bytes, addr: tuple):
+        info = parse_poll_reply(data, time.monotonic())
+        if info is None:
+            return None
+
+        self.replies_received += 1
+        key = (info.ip, info.bind_index)
+        known = self._nodes.get(key)
+        self._nodes[key] = info
+        if known is None or not known.same_as(info):
+            log.info(f"Found Art-Net node {info.short_name} ({info.long_name}) at {info.ip}, "
+                     f"universes {sorted(info.universes)}")
+            self._notify()
+
+    def expire(self, now: float):
+        expired = [key for key, info in self._nodes.items() if now - info.last_seen > self._ttl]
+        for key in expired:
+            info = self._nodes.pop(key)
+            log.info(f"Art-Net node {info.short_name} at {info.ip} stopped answering")
+        if expired:
+            self._notify()
+
+    def _notify(self):
+        for listener in tuple(self._listeners):
+            listener()
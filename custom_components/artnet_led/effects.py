@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import colorsys
+import math
+import random
+import time
+from itertools import chain
+
+from .output import cie_lightness
+
+PALETTE_SIZE = 256
+
+Color = tuple[float, float, float]
+
+
+def color_ramp(start: Color, end: Color, curve=None) -> list[Color]:
+    """PALETTE_SIZE colors from start to end, optionally shaped by a curve"""
+    colors = []
+    for k in range(PALETTE_SIZE):
+        progress = k / (PALETTE_SIZE - 1)
+        if curve is not None:
+            progress = curve(progress)
+        colors.append(tuple(a + (b - a) * progress for a, b in zip(start, end)))
+    return colors
+
+
+class Effect:
+    """
+    An animation of the pixels of a light. Every frame an effect only picks an entry of a palette of
+    PALETTE_SIZE colors for each pixel. The palette is rendered to DMX values once by the light, so a
+    frame costs one lookup per pixel no matter how the light maps colors to its channels.
+
+    Pixels are placed by their position from 0 to 1, so an effect can run over several lights.
+    """
+
+    name = ""
+
+    # Seconds of one cycle of the effect
+    period = 5.0
+
+    def palette(self, color: Color) -> list[Color]:
+        """Return the palette for the given color of the light, components go from 0 to 255"""
+        return color_ramp((0, 0, 0), color)
+
+    def init_state(self, positions: list[float]):
+        """Return the state an effect keeps per renderer, e.g. for random pixels"""
+        return None
+
+    def indices(self, elapsed: float, positions: list[float], state) -> list[int]:
+        """Return the palette index of every pixel, elapsed seconds after the effect started"""
+        raise NotImplementedError()
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} {self.name}>"
+
+
+class Chase(Effect):
+    """A spot of the light color running over the pixels, with a fading tail"""
+
+    name = "chase"
+    period = 2.0
+
+    # The tail is 1 / TAIL of all pixels long
+    TAIL = 4
+
+    def indices(self, elapsed, positions, state):
+        head = elapsed / self.period % 1
+        tail = self.TAIL * (PALETTE_SIZE - 1)
+        indices = []
+        for position in positions:
+            index = int((PALETTE_SIZE - 1) - (head - position) % 1 * tail)
+            indices.append(index if index > 0 else 0)
+        return indices
+
+
+class Rainbow(Effect):
+    """All hues spread over the pixels, moving along"""
+
+    name = "rainbow"
+    period = 10.0
+
+    def palette(self, color):
+        return [
+            tuple(c * 255 for c in colorsys.hsv_to_rgb(k / PALETTE_SIZE, 1, 1)) for k in range(PALETTE_SIZE)
+        ]
+
+    def indices(self, elapsed, positions, state):
+        offset = elapsed / self.period
+        return [int((position + offset) * PALETTE_SIZE) % PALETTE_SIZE for position in positions]
+
+
+class Gradient(Effect):
+    """A gradient from the light color to its complementary color, slowly moving along the pixels"""
+
+    name = "gradient"
+    period = 20.0
+
+    def palette(self, color):
+        h, s, v = colorsys.rgb_to_hsv(*(c / 255 for c in color))
+        complementary = tuple(c * 255 for c in colorsys.hsv_to_rgb((h + 0.5) % 1, s, v))
+        return color_ramp(color, complementary)
+
+    def indices(self, elapsed, positions, state):
+        offset = elapsed / self.period
+        size = PALETTE_SIZE - 1
+        # Back and forth, so there is no edge where the gradient wraps around
+        return [int((1 - abs((position + offset) % 1 * 2 - 1)) * size) for position in positions]
+
+
+class Breathing(Effect):
+    """All pixels slowly fading in and out together"""
+
+    name = "breathing"
+    period = 4.0
+
+    def palette(self, color):
+        return color_ramp((0, 0, 0), color, cie_lightness)
+
+    def indices(self, elapsed, positions, state):
+        level = 0.5 - 0.5 * math.cos(2 * math.pi * elapsed / self.period)
+        return [int(level * (PALETTE_SIZE - 1))] * len(positions)
+
+
+class Twinkle(Effect):
+    """Pixels lighting up and fading out at random, each one at its own pace"""
+
+    name = "twinkle"
+    period = 3.0
+
+    def init_state(self, positions):
+        # rate and phase of every pixel
+        return [(random.uniform(0.5, 1.5) / self.period, random.random()) for _ in positions]
+
+    def indices(self, elapsed, positions, state):
+        size = PALETTE_SIZE - 1
+        tau = 2 * math.pi
+        indices = []
+        for rate, phase in state:
+            level = math.sin(tau * (elapsed * rate + phase))
+            indices.append(int(level * level * level * size) if level > 0 else 0)
+        return indices
+
+
+class Fire(Effect):
+    """Flickering like flames, in fire colors regardless of the light color"""
+
+    name = "fire"
+
+    def palette(self, color):
+        colors = []
+        for k in range(PALETTE_SIZE):
+            heat = k / (PALETTE_SIZE - 1)
+            # black -> red -> orange -> yellow
+            colors.append((min(1.0, heat * 2) * 255, max(0.0, heat * 2 - 1) * 200, 0))
+        return colors
+
+    def init_state(self, positions):
+        return [random.random() for _ in positions]
+
+    def indices(self, elapsed, positions, state):
+        size = PALETTE_SIZE - 1
+        uniform = random.uniform
+        indices = []
+        for i, heat in enumerate(state):
+            heat = heat * 0.6 + uniform(0.05, 0.35)
+            state[i] = heat
+            indices.append(int(heat * size))
+        return indices
+
+
+EFFECTS = {effect.name: effect for effect in (Chase(), Rainbow(), Twinkle(), Fire(), Gradient(), Breathing())}
+
+
+class EffectRenderer:
+    """
+    Runs an effect on the channel of a light: renders the raw values of the channel every frame.
+    The palette holds the DMX values of one pixel for each palette entry.
+
+    The pixels of the light are placed from phase to phase + span, lights which run an effect together
+    get consecutive ranges and the same start time.
+    """
+
+    def __init__(self, effect: Effect, palette: list[list[int]], pixels: int, start: float | None = None,
+                 phase: float = 0.0, span: float = 1.0):
+        self.effect = effect
+        self.palette = palette
+        self.start = time.monotonic() if start is None else start
+        self.phase = phase
+        self.span = span
+        self._positions = [phase + span * (pixel + 0.5) / pixels for pixel in range(pixels)]
+        self._state = effect.init_state(self._positions)
+
+    def render(self, now: float, raw: list[int]):
+        indices = self.effect.indices(now - self.start, self._positions, self._state)
+        raw[:] = chain.from_iterable(map(self.palette.__getitem__, indices))
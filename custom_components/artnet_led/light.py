@@ -1,7 +1,12 @@
 from __future__ import annotations
 
+import asyncio
+import cProfile
+import io
 import logging
+import pstats
 import time
+from functools import lru_cache
 
 import homeassistant.helpers.config_validation as cv
 import homeassistant.util.color as color_util
@@ -10,6 +15,7 @@ import voluptuous as vol
 from homeassistant.components.light import (
     ATTR_BRIGHTNESS,
     ATTR_COLOR_TEMP,
+    ATTR_EFFECT,
     ATTR_RGB_COLOR,
     ATTR_RGBW_COLOR,
     ATTR_RGBWW_COLOR,
@@ -19,21 +25,32 @@ from homeassistant.components.light import (
     COLOR_MODE_RGB,
     COLOR_MODE_RGBW,
     COLOR_MODE_RGBWW,
+    SUPPORT_EFFECT,
     SUPPORT_TRANSITION,
     PLATFORM_SCHEMA,
     LightEntity, COLOR_MODE_ONOFF, COLOR_MODE_WHITE,
 )
+from homeassistant.components.light import DOMAIN as LIGHT_DOMAIN
 from homeassistant.util.color import color_rgb_to_rgbw
-from homeassistant.const import CONF_DEVICES, STATE_OFF, STATE_ON
+from homeassistant.const import ATTR_STATE, CONF_DEVICES, EVENT_HOMEASSISTANT_STOP, STATE_OFF, STATE_ON, Platform
 from homeassistant.const import CONF_FRIENDLY_NAME as CONF_DEVICE_FRIENDLY_NAME
 from homeassistant.const import CONF_HOST as CONF_NODE_HOST
 from homeassistant.const import CONF_NAME as CONF_DEVICE_NAME
 from homeassistant.const import CONF_PORT as CONF_NODE_PORT
 from homeassistant.const import CONF_TYPE as CONF_DEVICE_TYPE
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.exceptions import HomeAssistantError, PlatformNotReady
+from homeassistant.helpers.discovery import async_load_platform
 from homeassistant.helpers.entity_registry import async_get, RegistryEntry
 from homeassistant.helpers.restore_state import RestoreEntity
 
+from .discovery import ARTNET_BROADCAST, ARTNET_PORT, ArtPollDiscovery, is_broadcast
+from .effects import EFFECTS, EffectRenderer
+from .output import OutputNode, OutputStats, OutputChannel, OutputChannel16Bit, OutputChannel24Bit, \
+    OutputChannel32Bit, OutputCorrection, curve_correction, gamma_correction, Easing, EASINGS, OUTPUT_PROTOCOLS, \
+    SACN_DEFAULT_PRIORITY, SACN_PORT
+from .receiver import ArtNetReceiver
+
 CONF_DEVICE_TRANSITION = ATTR_TRANSITION
 
 CONF_INITIAL_VALUES = "initial_values"
@@ -46,84 +63,168 @@ REQUIREMENTS = ["pyartnet == 0.8.3"]
 log.info(f"PyArtNet: {REQUIREMENTS[0]}")
 log.info(f"Version : 2021.07.10")
 
+CONF_NODE_NAME = "node_name"
+CONF_NODE_PROTOCOL = "protocol"
+CONF_NODE_PRIORITY = "priority"
+CONF_NODE_PREVIEW = "preview"
+CONF_NODE_SYNC = "sync"
+CONF_NODE_BROADCAST = "broadcast"
 CONF_NODE_MAX_FPS = "max_fps"
 CONF_NODE_REFRESH = "refresh_every"
+CONF_NODE_STATE_UPDATE = "state_update_every"
+CONF_NODE_EXPOSE_DMX_VALUES = "expose_dmx_values"
+CONF_NODE_DIAGNOSTICS = "diagnostics"
+CONF_NODE_RECEIVE = "receive"
+CONF_NODE_RECEIVE_PORT = "receive_port"
 CONF_NODE_UNIVERSES = "universes"
 
 CONF_DEVICE_CHANNEL = "channel"
 CONF_DEVICE_VALUE = "value"
 CONF_OUTPUT_CORRECTION = "output_correction"
 CONF_CHANNEL_SIZE = "channel_size"
+CONF_DEVICE_EASING = "easing"
+CONF_DEVICE_PIXELS = "pixels"
+CONF_DEVICE_SEGMENTS = "segments"
 
 CONF_DEVICE_MIN_TEMP = "min_temp"
 CONF_DEVICE_MAX_TEMP = "max_temp"
 CONF_CHANNEL_SETUP = "channel_setup"
 
 DOMAIN = "dmx"
+INTEGRATION_DOMAIN = "artnet_led"
 
-AVAILABLE_CORRECTIONS = {
-    "linear": None,
-    "quadratic": None,
-    "cubic": None,
-    "quadruple": None,
-}
+DATA_FADE_BATCH = "fade_batch"
+DATA_NODES = "nodes"
+DATA_LIGHTS = "lights"
+DATA_PROFILER = "profiler"
+
+CONF_NODE_ID = "node_id"
+
+PROTOCOL_ARTNET = "artnet"
+PROTOCOL_SACN = "sacn"
+DEFAULT_PORTS = {PROTOCOL_ARTNET: ARTNET_PORT, PROTOCOL_SACN: SACN_PORT}
+# sACN receivers drop a source after 2.5s without a packet, so its keepalive has to come well before
+DEFAULT_REFRESH = {PROTOCOL_ARTNET: 120, PROTOCOL_SACN: 1}
+SACN_MAX_REFRESH = 2
+
+# Node id of an sACN node without host, which sends to the multicast groups of its universes
+SACN_MULTICAST = "multicast"
+
+SERVICE_APPLY_SCENE = "apply_scene"
+SERVICE_PROFILE = "profile"
+SERVICE_APPLY_EFFECT = "apply_effect"
+ATTR_ENTITIES = "entities"
+ATTR_EASING = "easing"
+ATTR_DURATION = "duration"
 
 
 def linear_output_correction(val: float, max_val: int = 0xFF):
     return val
 
 
-AVAILABLE_CORRECTIONS["linear"] = linear_output_correction
-AVAILABLE_CORRECTIONS["quadratic"] = pyartnet.output_correction.quadratic
-AVAILABLE_CORRECTIONS["cubic"] = pyartnet.output_correction.cubic
-AVAILABLE_CORRECTIONS["quadruple"] = pyartnet.output_correction.quadruple
-
-CHANNEL_SIZE = {
-    "8bit": (1, pyartnet.DmxChannel, 1),
-    "16bit": (2, pyartnet.DmxChannel16Bit, 256),
-    "24bit": (3, pyartnet.DmxChannel24Bit, 256 * 256),
-    "32bit": (4, pyartnet.DmxChannel32Bit, 256 ** 3),
+AVAILABLE_CORRECTIONS = {
+    "linear": OutputCorrection("linear", linear_output_correction),
+    "quadratic": OutputCorrection("quadratic", pyartnet.output_correction.quadratic),
+    "cubic": OutputCorrection("cubic", pyartnet.output_correction.cubic),
+    "quadruple": OutputCorrection("quadruple", pyartnet.output_correction.quadruple),
 }
 
-ARTNET_NODES = {}
+CUSTOM_CORRECTIONS = {}
 
 
-async def async_setup_platform(hass: HomeAssistant, config, async_add_devices, discovery_info=None):
-    import pprint
+def get_output_correction(value) -> OutputCorrection | None:
+    """Return the output correction for a configured value: a name, a gamma value or a list of curve points"""
+    if value is None or isinstance(value, str):
+        return AVAILABLE_CORRECTIONS.get(value)
+
+    key = tuple(value) if isinstance(value, list) else value
+    correction = CUSTOM_CORRECTIONS.get(key)
+    if correction is None:
+        if isinstance(value, list):
+            correction = curve_correction(value)
+        else:
+            correction = gamma_correction(value)
+        CUSTOM_CORRECTIONS[key] = correction
+    return correction
+
 
-    for line in pprint.pformat(config).splitlines():
-        log.info(line)
+# Number of entities handed to Home Assistant at once
+ENTITY_CHUNK_SIZE = 250
 
-    host = config.get(CONF_NODE_HOST)
+CHANNEL_SIZE = {
+    "8bit": (1, OutputChannel, 1),
+    "16bit": (2, OutputChannel16Bit, 256),
+    "24bit": (3, OutputChannel24Bit, 256 * 256),
+    "32bit": (4, OutputChannel32Bit, 256 ** 3),
+}
+
+
+async def async_setup_platform(hass: HomeAssistant, config, async_add_devices, discovery_info=None):
+    # A node configured by its short name keeps that name in its id and the unique ids of its lights
+    host = config.get(CONF_NODE_HOST) or config.get(CONF_NODE_NAME, SACN_MULTICAST)
     port = config.get(CONF_NODE_PORT)
 
-    # setup Node
-    __id = f"{host}:{port}"
-    if __id not in ARTNET_NODES:
-        __node = pyartnet.ArtNetNode(
-            host,
-            port,
-            max_fps=config[CONF_NODE_MAX_FPS],
-            refresh_every=config[CONF_NODE_REFRESH],
+    data = hass.data.setdefault(INTEGRATION_DOMAIN, {})
+    if DATA_FADE_BATCH not in data:
+        data[DATA_FADE_BATCH] = FadeBatch(hass)
+        data[DATA_LIGHTS] = {}
+        data[DATA_NODES] = ArtNetNodeManager(hass)
+        async_register_services(hass)
+    batch = data[DATA_FADE_BATCH]
+    node_manager = data[DATA_NODES]  # type: ArtNetNodeManager
+
+    # setup Node, entries with the same host and port share it
+    protocol = config[CONF_NODE_PROTOCOL]
+    node_id = node_manager.node_id(host, port, protocol)
+    try:
+        node = await node_manager.async_get_node(host, port, config)
+    except OSError as e:
+        raise PlatformNotReady(f"Unable to start the output to {node_id}: {e}") from e
+
+    # Held until the first light of this entry uses the node, so other entries can't stop it in the meantime
+    node_manager.acquire(node_id)
+    node_context = NodeContext(
+        node_id, batch, node_manager.get_publisher(node_id), node.stats, config[CONF_NODE_EXPOSE_DMX_VALUES]
+    )
+    if node.stats is not None and node_manager.claim_diagnostics(node_id):
+        hass.async_create_task(
+            async_load_platform(hass, Platform.SENSOR, INTEGRATION_DOMAIN, {CONF_NODE_ID: node_id}, {})
         )
-        await __node.start()
-        ARTNET_NODES[id] = __node
-    node = ARTNET_NODES[id]
-    assert isinstance(node, pyartnet.ArtNetNode), type(node)
 
-    entity_registry = async_get(hass)
-    await entity_registry.async_load()
+    # Receive the frames of other controllers, e.g. a lighting desk, and take over their values
+    receiver = None
+    if config[CONF_NODE_RECEIVE]:
+        # The receiver takes Art-Net, also for nodes which send sACN
+        receive_port = config.get(
+            CONF_NODE_RECEIVE_PORT, port if protocol == PROTOCOL_ARTNET else ARTNET_PORT
+        )
+        try:
+            receiver = await node_manager.async_get_receiver(receive_port)
+        except OSError as e:
+            log.error(f"Unable to receive Art-Net on port {receive_port}: {e}")
+
+    # Lights of sACN nodes get their own unique ids, universe 1 of sACN isn't universe 1 of Art-Net
+    unique_id_prefix = f"{DOMAIN}:{host}" if protocol == PROTOCOL_ARTNET else f"{DOMAIN}:{protocol}:{host}"
+
+    # Unique IDs of the existing lights by entity id, built in one pass over the registry
+    registered_unique_ids = {}
+    disabled_unique_ids = set()
+    for entry in async_get(hass).entities.values():
+        if entry.domain == LIGHT_DOMAIN and entry.unique_id is not None:
+            registered_unique_ids[entry.entity_id] = entry.unique_id
+            if entry.disabled_by is not None and entry.platform == INTEGRATION_DOMAIN:
+                disabled_unique_ids.add(entry.unique_id)
 
     device_list = []
-    used_unique_ids = []
+    used_unique_ids = set()
     for universe_nr, universe_cfg in config[CONF_NODE_UNIVERSES].items():
         try:
             universe = node.get_universe(universe_nr)
         except KeyError:
             universe = node.add_universe(universe_nr)
-            universe.output_correction = AVAILABLE_CORRECTIONS.get(
-                universe_cfg[CONF_OUTPUT_CORRECTION]
-            )
+            universe.output_correction = get_output_correction(universe_cfg[CONF_OUTPUT_CORRECTION])
+        if receiver is not None:
+            receiver.add_universe(universe_nr, universe)
 
         if CONF_INITIAL_VALUES in universe_cfg.keys():
             for _ in universe_cfg[CONF_INITIAL_VALUES]:  # type: dict
@@ -134,24 +235,22 @@ async def async_setup_platform(hass: HomeAssistant, config, async_add_devices, d
             cls = __CLASS_TYPE[device[CONF_DEVICE_TYPE]]
 
             channel = device[CONF_DEVICE_CHANNEL]
-            unique_id = f"{DOMAIN}:{host}/{universe_nr}/{channel}"
+            unique_id = f"{unique_id_prefix}/{universe_nr}/{channel}"
 
             name: str = device[CONF_DEVICE_NAME]
 
             entity_id = f"light.{name.replace(' ', '_').lower()}"
 
             # If the entity has another unique ID, use that until it's migrated properly
-            entity = entity_registry.async_get(entity_id)
-            if entity:
-                logging.info(f"Found existing entity for name {entity_id}, using unique id {unique_id}")
-                if entity.unique_id is not None and entity.unique_id not in used_unique_ids:
-                    unique_id = entity.unique_id
-            used_unique_ids.append(unique_id)
+            registered_unique_id = registered_unique_ids.get(entity_id)
+            if registered_unique_id is not None and registered_unique_id not in used_unique_ids:
+                unique_id = registered_unique_id
+            used_unique_ids.add(unique_id)
 
             # create device
             device["unique_id"] = unique_id
             d = cls(**device)  # type: DmxBaseLight
-            d.set_type(device[CONF_DEVICE_TYPE])
+            d.set_node_context(node_context)
             d.set_channel(
                 universe.add_channel(
                     start=channel,
@@ -161,60 +260,710 @@ async def async_setup_platform(hass: HomeAssistant, config, async_add_devices, d
                 )
             )
 
-            d.channel.output_correction = AVAILABLE_CORRECTIONS.get(
-                device[CONF_OUTPUT_CORRECTION]
-            )
+            d.channel.output_correction = get_output_correction(device[CONF_OUTPUT_CORRECTION])
 
             d.set_initial_brightness(device[CONF_DEVICE_VALUE])
 
+            if receiver is not None:
+                d.channel.callback_values_received = d.values_received
+
             device_list.append(d)
-    async_add_devices(device_list)
+
+            # Segments of a pixel strip are lights on a part of the channel of the strip
+            if isinstance(d, DmxPixelStrip):
+                for segment in d.segments:
+                    segment.set_node_context(node_context)
+                    segment.set_channel(d.channel)
+                    device_list.append(segment)
+
+    node_manager.update_destinations(node_id)
+    log.debug(f"Set up {len(device_list)} lights in {len(config[CONF_NODE_UNIVERSES])} universes on {node_id}")
+
+    # Disabled lights aren't added, if none is left the node is stopped unless other entries use it
+    if all(d.unique_id in disabled_unique_ids for d in device_list):
+        await node_manager.async_release(node_id)
+    else:
+        node_context.setup_reference = True
+
+    # Add the entities in chunks, so large installs don't block the event loop in one go
+    for i in range(0, len(device_list), ENTITY_CHUNK_SIZE):
+        async_add_devices(device_list[i:i + ENTITY_CHUNK_SIZE])
+        await asyncio.sleep(0)
 
     return True
 
 
+class ArtNetNodeManager:
+    """
+    Shares one ArtNetNode, and thus one socket and one refresh loop, per host and port between
+    all platform entries. Universes of the entries are merged into that node. Nodes are
+    reference counted by the lights using them and stopped when the last light is removed.
+    Likewise there is one ArtNetReceiver per port, for all entries which receive.
+
+    Nodes configured by name or with a broadcast address use one shared ArtPollDiscovery. Their universes
+    are sent unicast to the nodes found for them, and broadcast as long as none are known.
+    """
+
+    def __init__(self, hass: HomeAssistant):
+        self._hass = hass
+        self._nodes = {}
+        self._publishers = {}
+        self._refs = {}
+        self._diagnostics = set()
+        self._receivers = {}
+        self._discovery: ArtPollDiscovery | None = None
+        self._discovery_lock = asyncio.Lock()
+        self._discovering = {}
+        self._starting: dict[str, asyncio.Future] = {}
+
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, self.async_stop_all)
+
+    @staticmethod
+    def node_id(host: str, port: int, protocol: str = PROTOCOL_ARTNET) -> str:
+        if protocol != PROTOCOL_ARTNET:
+            return f"{protocol}:{host}:{port}"
+        return f"{host}:{port}"
+
+    async def async_get_node(self, host: str, port: int, config) -> OutputNode:
+        """Return the node for host and port, the node is created and started if it doesn't exist yet"""
+        protocol = config[CONF_NODE_PROTOCOL]
+        node_id = self.node_id(host, port, protocol)
+        node = self._nodes.get(node_id)
+        if node is not None:
+            log.debug(f"Reusing node {node_id}")
+            # An entry set up concurrently may still be starting it
+            starting = self._starting.get(node_id)
+            if starting is not None:
+                await starting
+            return node
+
+        options = {
+            "max_fps": config[CONF_NODE_MAX_FPS],
+            "refresh_every": config[CONF_NODE_REFRESH],
+            "collect_stats": config[CONF_NODE_DIAGNOSTICS],
+        }
+        node_name = config.get(CONF_NODE_NAME)
+        if protocol == PROTOCOL_SACN:
+            # sACN nodes send to the multicast groups of the universes or to host, they aren't discovered
+            discover = False
+            address = config.get(CONF_NODE_HOST)
+            options["priority"] = config.get(CONF_NODE_PRIORITY, SACN_DEFAULT_PRIORITY)
+            options["preview"] = config.get(CONF_NODE_PREVIEW, False)
+        else:
+            # Until discovery found it, a node configured by name gets the universes as broadcast
+            discover = node_name is not None or config[CONF_NODE_BROADCAST] or is_broadcast(host)
+            address = ARTNET_BROADCAST if node_name is not None else host
+            options["connect"] = not discover
+            options["sync"] = config[CONF_NODE_SYNC]
+        node = OUTPUT_PROTOCOLS[protocol](address, port, **options)
+
+        # Register before starting, entries set up concurrently have to get the same node
+        self._nodes[node_id] = node
+        self._publishers[node_id] = StatePublisher(self._hass, config[CONF_NODE_STATE_UPDATE], node.stats)
+        self._refs[node_id] = 0
+
+        starting = self._starting[node_id] = asyncio.ensure_future(node.start())
+        try:
+            await starting
+        except Exception:
+            # Don't leave a dead node behind for the next entries with this host and port
+            self._nodes.pop(node_id)
+            self._publishers.pop(node_id)
+            self._refs.pop(node_id)
+            raise
+        finally:
+            self._starting.pop(node_id)
+        for receiver in self._receivers.values():
+            receiver.ignore(node.own_addresses)
+
+        if discover:
+            self._discovering[node_id] = node_name
+            discovery = await self.async_get_discovery()
+            discovery.add_broadcast(ARTNET_BROADCAST if node_name is not None else host, port)
+        return node
+
+    async def async_get_discovery(self) -> ArtPollDiscovery:
+        """Return the discovery, it's started on the Art-Net port if it isn't running yet"""
+        async with self._discovery_lock:
+            if self._discovery is not None:
+                return self._discovery
+
+            # Nodes should answer ArtPolls on the Art-Net port, some answer the port the poll came from
+            try:
+                receiver = await self.async_get_receiver(ARTNET_PORT)
+            except OSError as e:
+                log.warning(f"Unable to listen on port {ARTNET_PORT} for Art-Net nodes, "
+                            f"only nodes which answer the port of the poll will be found: {e}")
+                receiver = await self.async_get_receiver(0)
+
+            self._discovery = ArtPollDiscovery(receiver)
+            self._discovery.add_listener(self._discovery_changed)
+            await self._discovery.start()
+            return self._discovery
+
+    def _discovery_changed(self):
+        for node_id in self._discovering:
+            self.update_destinations(node_id)
+
+    def update_destinations(self, node_id: str):
+        """Send the universes of a node which uses discovery to the nodes which were found for them"""
+        node = self._nodes.get(node_id)
+        if node is None or node_id not in self._discovering or self._discovery is None:
+            return None
+
+        node_name = self._discovering[node_id]
+        if node_name is not None:
+            ip = self._discovery.find(node_name)
+            hosts = (ip,) if ip is not None else ()
+            for nr in node.universe_numbers:
+                node.set_destinations(nr, hosts)
+        else:
+            for nr in node.universe_numbers:
+                node.set_destinations(nr, self._discovery.resolve(nr))
+
+    @property
+    def discovery(self) -> ArtPollDiscovery | None:
+        return self._discovery
+
+    async def async_get_receiver(self, port: int) -> ArtNetReceiver:
+        """Return the receiver on the given port, it's created and started if it doesn't exist yet"""
+        receiver = self._receivers.get(port)
+        if receiver is not None:
+            return receiver
+
+        # Register before starting, like the nodes
+        receiver = self._receivers[port] = ArtNetReceiver(port)
+        for node in self._nodes.values():
+            receiver.ignore(node.own_addresses)
+        try:
+            await receiver.start()
+        except OSError:
+            del self._receivers[port]
+            raise
+        return receiver
+
+    def get_node(self, node_id: str) -> OutputNode | None:
+        return self._nodes.get(node_id)
+
+    def get_publisher(self, node_id: str) -> StatePublisher:
+        return self._publishers[node_id]
+
+    def claim_diagnostics(self, node_id: str) -> bool:
+        """Return True the first time it's called for a node, its diagnostic sensors then have to be set up"""
+        if node_id in self._diagnostics:
+            return False
+        self._diagnostics.add(node_id)
+        return True
+
+    def acquire(self, node_id: str):
+        self._refs[node_id] += 1
+
+    async def async_release(self, node_id: str):
+        """Release a reference to the node, the node is stopped if it isn't used anymore"""
+        if node_id not in self._refs:
+            return None
+
+        self._refs[node_id] -= 1
+        if self._refs[node_id] <= 0:
+            await self._async_stop(node_id)
+
+    async def async_stop_all(self, event=None):
+        for node_id in tuple(self._nodes):
+            await self._async_stop(node_id)
+
+    async def _async_stop(self, node_id: str):
+        node = self._nodes.pop(node_id)
+        self._publishers.pop(node_id)
+        self._refs.pop(node_id)
+        self._discovering.pop(node_id, None)
+
+        await node.stop()
+        log.debug(f"Stopped node {node_id}")
+
+        # Receivers only feed the universes of the nodes, without nodes they aren't needed anymore
+        if not self._nodes:
+            if self._discovery is not None:
+                await self._discovery.stop()
+                self._discovery = None
+            await self._async_stop_receivers()
+
+    async def _async_stop_receivers(self):
+        for port in tuple(self._receivers):
+            await self._receivers.pop(port).stop()
+
+
+def async_register_services(hass: HomeAssistant):
+    data = hass.data[INTEGRATION_DOMAIN]
+
+    async def async_apply_scene(call: ServiceCall):
+        """Set the state of several lights, all their fades start on the same frame"""
+        lights = data[DATA_LIGHTS]
+
+        with data[DATA_FADE_BATCH].transaction():
+            for entity_id, attributes in call.data[ATTR_ENTITIES].items():
+                light = lights.get(entity_id)  # type: DmxBaseLight
+                if light is None:
+                    log.warning(f"{entity_id} is not an Art-Net light, it's skipped in the scene")
+                    continue
+
+                attributes = dict(attributes or {})
+                state = attributes.pop(ATTR_STATE, STATE_ON)
+                if ATTR_TRANSITION in call.data:
+                    attributes.setdefault(ATTR_TRANSITION, call.data[ATTR_TRANSITION])
+                if ATTR_EASING in call.data:
+                    attributes.setdefault(ATTR_EASING, call.data[ATTR_EASING])
+
+                if state == STATE_OFF:
+                    await light.async_turn_off(**attributes)
+                else:
+                    await light.async_turn_on(**attributes)
+
+    async def async_profile(call: ServiceCall):
+        """
+        Profile the event loop for a while, this covers the output loops of all nodes as well as
+        turning lights on and calculating their values. The result is written to the config dir.
+        """
+        if data.get(DATA_PROFILER) is not None:
+            raise HomeAssistantError("A profile is already being recorded")
+
+        duration = call.data[ATTR_DURATION]
+        log.warning(f"Profiling for {duration}s, Home Assistant will be slower in the meantime")
+
+        profiler = data[DATA_PROFILER] = cProfile.Profile()
+        profiler.enable()
+        try:
+            await asyncio.sleep(duration)
+        finally:
+            profiler.disable()
+            data[DATA_PROFILER] = None
+
+        path = hass.config.path(f"{INTEGRATION_DOMAIN}_profile_{time.strftime('%Y%m%d_%H%M%S')}")
+        await hass.async_add_executor_job(write_profile, profiler, path)
+        log.warning(f"Profile written to {path}.prof and {path}.txt")
+
+    async def async_apply_effect(call: ServiceCall):
+        """
+        Run an effect over several lights, as if they were the pixels of one strip. The lights are
+        placed in the given order, each one takes as much room as it has pixels. The lights keep
+        their brightness and color.
+        """
+        effect_lights = []
+        for entity_id in call.data[ATTR_ENTITIES]:
+            light = data[DATA_LIGHTS].get(entity_id)
+            if not isinstance(light, DmxEffectLight) or not light.effect_list:
+                log.warning(f"{entity_id} is not an Art-Net light with effects, it's skipped in the effect")
+                continue
+            effect_lights.append(light)
+
+        pixels = sum(light.pixel_count for light in effect_lights)
+        start = time.monotonic()
+        position = 0
+        for light in effect_lights:
+            light.start_effect(call.data[ATTR_EFFECT], start, position / pixels, light.pixel_count / pixels)
+            light.write_state()
+            position += light.pixel_count
+
+    hass.services.async_register(
+        INTEGRATION_DOMAIN, SERVICE_APPLY_SCENE, async_apply_scene, schema=APPLY_SCENE_SCHEMA
+    )
+    hass.services.async_register(
+        INTEGRATION_DOMAIN, SERVICE_PROFILE, async_profile, schema=PROFILE_SCHEMA
+    )
+    hass.services.async_register(
+        INTEGRATION_DOMAIN, SERVICE_APPLY_EFFECT, async_apply_effect, schema=APPLY_EFFECT_SCHEMA
+    )
+
+
+def write_profile(profiler: cProfile.Profile, path: str):
+    """Write the raw profile, e.g. for snakeviz, and a text summary of the calls of the integration"""
+    profiler.dump_stats(f"{path}.prof")
+
+    summary = io.StringIO()
+    stats = pstats.Stats(profiler, stream=summary)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE)
+    stats.print_stats(f"{INTEGRATION_DOMAIN}|pyartnet", 100)
+    with open(f"{path}.txt", "w") as file:
+        file.write(summary.getvalue())
+
+
+# Color conversions are cached for all lights together, lights mostly share a handful of colors
+COLOR_CACHE_SIZE = 1024
+
+
+@lru_cache(maxsize=COLOR_CACHE_SIZE)
+def _cached_rgb_to_rgbw(r: int, g: int, b: int) -> tuple:
+    return color_rgb_to_rgbw(r, g, b)
+
+
+def cached_rgb_to_rgbw(r: float, g: float, b: float) -> tuple:
+    """color_rgb_to_rgbw of Home Assistant, the color is rounded to whole values to share cache entries"""
+    return _cached_rgb_to_rgbw(round(r), round(g), round(b))
+
+
+@lru_cache(maxsize=COLOR_CACHE_SIZE)
+def cached_rgbww_to_color_temperature(rgbww: tuple, min_mireds: int, max_mireds: int) -> tuple:
+    """rgbww_to_color_temperature of Home Assistant, rgbww has to be a tuple"""
+    return color_util.rgbww_to_color_temperature(rgbww, min_mireds, max_mireds)
+
+
+def color_cache_info() -> dict:
+    """Hits and misses of the color conversion caches"""
+    return {
+        name: function.cache_info()._asdict()
+        for name, function in (
+            ("rgb_to_rgbw", _cached_rgb_to_rgbw),
+            ("rgbww_to_color_temperature", cached_rgbww_to_color_temperature),
+        )
+    }
+
+
+@lru_cache(maxsize=None)
+def dmx_channel_range(start: int, width: int) -> tuple:
+    """The DMX channels of a light for its state attributes, lights at the same channels share the tuple"""
+    return tuple(range(start, start + width))
+
+
+# Attributes of a turn on which set a color, they stop a running effect
+COLOR_ATTRIBUTES = (ATTR_RGB_COLOR, ATTR_RGBW_COLOR, ATTR_RGBWW_COLOR, ATTR_COLOR_TEMP)
+
+
 def convert_to_mireds(kelvin_string):
     kelvin_number = int(kelvin_string[:-1])
     return color_util.color_temperature_kelvin_to_mired(kelvin_number)
 
 
+# Operations a channel_setup letter can be compiled to
+OP_ZERO = 0             # unknown letter, always 0
+OP_DIMMER = 1           # brightness
+OP_SCALED = 2           # value * brightness / max
+OP_UNSCALED = 3         # value * 255 / max
+OP_FRACTION_SCALED = 4  # brightness * (value / max)
+OP_TEMP = 5             # 255 - temperature * 255
+OP_TEMP_INVERTED = 6    # temperature * 255
+
+
+class ChannelSetup:
+    """
+    A channel_setup string, parsed once into a tuple of (letter, operation, index) entries.
+    Rendering walks that tuple without creating closures or doing dict lookups.
+    """
+
+    _CACHE = {}
+
+    @classmethod
+    def get(cls, channel_setup: str, operations: dict, multiplier: int) -> ChannelSetup:
+        """Return the shared instance, fixtures with the same setup use the same object"""
+        key = (channel_setup, tuple(operations.items()), multiplier)
+        setup = cls._CACHE.get(key)
+        if setup is None:
+            setup = cls._CACHE[key] = cls(channel_setup, operations, multiplier)
+        return setup
+
+    def __init__(self, channel_setup: str, operations: dict, multiplier: int):
+        self._setup = channel_setup
+        self._multiplier = multiplier
+        self._ops = tuple(
+            (letter,) + operations.get(letter, (OP_ZERO, 0)) for letter in channel_setup
+        )
+        self._uses_temperature = any(op in (OP_TEMP, OP_TEMP_INVERTED) for _, op, _ in self._ops)
+        self._has_white = "w" in channel_setup or "W" in channel_setup
+
+    def __len__(self):
+        return len(self._ops)
+
+    @property
+    def has_white(self) -> bool:
+        return self._has_white
+
+    @property
+    def uses_temperature(self) -> bool:
+        return self._uses_temperature
+
+    def render(self, is_on, brightness, vals, max_value, temperature=0.0) -> list:
+        """Return the DMX values for the given state"""
+        multiplier = self._multiplier
+
+        values = list()
+        for letter, op, index in self._ops:
+            if op == OP_SCALED:
+                value = is_on * vals[index] * brightness / max_value
+            elif op == OP_UNSCALED:
+                value = is_on * vals[index] * 255 / max_value
+            elif op == OP_DIMMER:
+                value = brightness
+            elif op == OP_FRACTION_SCALED:
+                value = is_on * brightness * (vals[index] / max_value)
+            elif op == OP_TEMP:
+                value = 255 - (temperature * 255)
+            elif op == OP_TEMP_INVERTED:
+                value = temperature * 255
+            else:
+                value = 0
+
+            if value < 0 or value > 256:
+                log.warning(f"Value for channel {letter} isn't within bound: {value}")
+                value = max(0, min(256, value))
+            values.append(int(round(value * multiplier)))
+
+        return values
+
+    def parse(self, values: list, size: int) -> tuple[float | None, list, float | None]:
+        """
+        Approximately invert render for DMX values which were set from outside, e.g. by a desk.
+        Return the brightness, the size values scaled so the brightest one is 255 and the temperature.
+        The brightness is the dimmer channel, or else the brightest value which is scaled by the
+        brightness. Brightness and temperature are None if no channel tells them.
+        """
+        multiplier = self._multiplier
+
+        vals = [0.0] * size
+        brightness = temperature = scaled = None
+        for (letter, op, index), value in zip(self._ops, values):
+            value /= multiplier
+            if op == OP_SCALED or op == OP_FRACTION_SCALED:
+                vals[index] = value
+                scaled = value if scaled is None else max(scaled, value)
+            elif op == OP_UNSCALED:
+                vals[index] = value
+            elif op == OP_DIMMER:
+                brightness = value
+            elif op == OP_TEMP:
+                temperature = 1 - value / 255
+            elif op == OP_TEMP_INVERTED:
+                temperature = value / 255
+
+        if brightness is None:
+            brightness = scaled
+        peak = max(vals)
+        if peak > 0:
+            vals = [value * 255 / peak for value in vals]
+        return brightness, vals, temperature
+
+
+class FadeBatch:
+    """
+    Collects the lights that got a new target and starts all their fades at once in the next
+    iteration of the event loop. Lights turned on together, e.g. by a scene or a light group,
+    thus start fading on the same frame. All targets are rendered in one pass, where lights
+    sharing the same target state are only rendered once.
+
+    A light which gets several targets before the commit, e.g. while a slider is dragged, only
+    fades to the last one. A light which is still fading is retargeted by its channel.
+    """
+
+    def __init__(self, hass: HomeAssistant):
+        self._hass = hass
+        self._pending = {}
+        self._scheduled = False
+        self._held = 0
+
+    def add(self, light: DmxBaseLight, transition: float, values: list | tuple | None = None,
+            easing: Easing | None = None):
+        """Queue a fade for a light, values are calculated on commit if not given"""
+        self._pending[light] = (transition, values, easing)
+        if not self._scheduled and not self._held:
+            self._scheduled = True
+            self._hass.loop.call_soon(self.commit)
+
+    def discard(self, light: DmxBaseLight):
+        """Drop the queued fade of a light"""
+        self._pending.pop(light, None)
+
+    def transaction(self) -> FadeTransaction:
+        return FadeTransaction(self)
+
+    def hold(self):
+        """Don't commit until release is called"""
+        self._held += 1
+
+    def release(self):
+        self._held -= 1
+        if not self._held and self._pending:
+            self.commit()
+
+    def commit(self):
+        """Calculate the target values of all queued lights and start their fades"""
+        self._scheduled = False
+        if self._held:
+            return None
+
+        pending = self._pending
+        self._pending = {}
+
+        rendered = {}
+        for light, (transition, values, easing) in pending.items():
+            # A light with a broken target, e.g. a restored state that doesn't fit, must not stop the others
+            try:
+                if values is None:
+                    key = light.get_target_key()
+                    values = rendered.get(key)
+                    if values is None:
+                        stats = light.stats
+                        if stats is None:
+                            values = rendered[key] = light.get_target_values()
+                        else:
+                            start = time.perf_counter()
+                            values = rendered[key] = light.get_target_values()
+                            stats.add_render(time.perf_counter() - start)
+
+                light.channel.add_fade(values, transition * 1000, easing)
+                light.fade_started()
+            except Exception:
+                log.exception(f"Error starting the fade of {light.entity_id}")
+
+        if len(pending) > 1:
+            log.debug(f"Committed {len(pending)} fades, rendered {len(rendered)} distinct targets")
+
+
+class FadeTransaction:
+    """
+    Context manager which holds back all fades until it exits, they are then all committed together.
+
+        with batch.transaction():
+            await light_1.async_turn_on(brightness=255)
+            await light_2.async_turn_off()
+    """
+
+    def __init__(self, batch: FadeBatch):
+        self._batch = batch
+
+    def __enter__(self):
+        self._batch.hold()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._batch.release()
+
+
+class StatePublisher:
+    """
+    Writes the state of the lights of a node while they are fading. Instead of reacting to
+    every value change of every channel, fading lights are collected and their state is
+    written in one go every interval. A finished fade is written immediately.
+
+    Lights write their other state changes through write as well, so state_writes counts all writes.
+    """
+
+    def __init__(self, hass: HomeAssistant, interval: float, stats: OutputStats | None = None):
+        self._hass = hass
+        self._interval = interval
+        self._stats = stats
+        self._fading = set()
+        self._received = set()
+        self._timer = None
+
+    def fade_started(self, light: DmxBaseLight):
+        self._fading.add(light)
+        if self._timer is None:
+            self._timer = self._hass.loop.call_later(self._interval, self._flush)
+
+    def values_received(self, light: DmxBaseLight):
+        """
+        The values of the light were set from outside. The light takes them over with the next write,
+        so a desk sending many frames per second costs one update per interval.
+        """
+        self._received.add(light)
+        if self._timer is None:
+            self._timer = self._hass.loop.call_later(self._interval, self._flush)
+
+    def fade_finished(self, light: DmxBaseLight):
+        self._fading.discard(light)
+        self.write(light)
+
+    def _flush(self):
+        self._timer = None
+
+        for light in self._received:
+            light.apply_dmx_values(light.get_dmx_values())
+            # written with the fading lights, and dropped again as its channel isn't fading
+            self._fading.add(light)
+        self._received.clear()
+
+        for light in tuple(self._fading):
+            if not light.channel.fade_running:
+                self._fading.discard(light)
+            self.write(light)
+
+        if self._fading:
+            self._timer = self._hass.loop.call_later(self._interval, self._flush)
+
+    def write(self, light: DmxBaseLight):
+        """Write the state of a light now, all writes of the lights of the node go through here"""
+        light.async_schedule_update_ha_state()
+
+        if self._stats is not None:
+            self._stats.state_writes += 1
+
+
+class NodeContext:
+    """What all lights of a platform entry share: their node, its state publisher and the fade batch"""
+
+    __slots__ = ("node_id", "batch", "publisher", "stats", "expose_dmx_values", "setup_reference")
+
+    def __init__(self, node_id: str, batch: FadeBatch, publisher: StatePublisher, stats: OutputStats | None,
+                 expose_dmx_values: bool):
+        self.node_id = node_id
+        self.batch = batch
+        self.publisher = publisher
+        self.stats = stats
+        self.expose_dmx_values = expose_dmx_values
+        # Whether the setup of the entry still holds a reference to the node
+        self.setup_reference = False
+
+
+class FixtureState:
+    """
+    The state of one light, kept apart from the entity in slots. An entity of Home Assistant already
+    carries about ten attributes of its own, with the state in its __dict__ as well a light has too many
+    attributes for a compact dict and costs several times the memory.
+    """
+
+    __slots__ = (
+        "is_on", "brightness", "values", "transition", "fade_time", "easing", "effect",
+        "attributes", "attributes_key",
+    )
+
+    def __init__(self, values, fade_time: float, easing: str):
+        self.is_on = False
+        self.brightness = 255
+        self.values = values
+        self.transition = fade_time
+        self.fade_time = fade_time
+        self.easing = easing
+        self.effect: EffectRenderer | None = None
+        # extra state attributes and what they were built from
+        self.attributes: dict | None = None
+        self.attributes_key: tuple | None = None
+
+
 class DmxBaseLight(LightEntity, RestoreEntity):
+    # Static per type, only the state and the channel are per light
+    _color_mode = None
+    _features = 0
+    _supported_color_modes: set = set()
+    _channel_width = 1
+
     def __init__(self, name, unique_id: str, **kwargs):
         self._name = name
-        self._channel = kwargs[CONF_DEVICE_CHANNEL]
-
         self._unique_id = unique_id
-
         self.entity_id = f"light.{name.replace(' ', '_').lower()}"
-        self._brightness = 255
-        self._attr_brightness = self._brightness
-        self._fade_time = kwargs[CONF_DEVICE_TRANSITION]
-        self._transition = self._fade_time
-        self._state = False
+
+        self._fixture = FixtureState(0, kwargs[CONF_DEVICE_TRANSITION], kwargs.get(CONF_DEVICE_EASING, "linear"))
         self._channel_size = CHANNEL_SIZE[kwargs[CONF_CHANNEL_SIZE]]
-        self._color_mode = kwargs[CONF_DEVICE_TYPE]
-        self._vals = 0
-        self._features = 0
-        self._supported_color_modes = set()
-        # channel & notification callbacks
         # noinspection PyTypeHints
         self._channel: self._channel_size[1] = None
-        self._channel_last_update = 0
-        self._scale_factor = 1
-        self._channel_width = 0
-        self._type = None
+        self._node_context: NodeContext | None = None
 
     def set_channel(self, channel):
         """Set the channel & the callbacks"""
         self._channel = channel
-        self._channel.callback_value_changed = self._channel_value_change
         self._channel.callback_fade_finished = self._channel_fade_finish
 
-    def set_type(self, type):
-        self._type = type
+    def set_node_context(self, node_context: NodeContext):
+        self._node_context = node_context
 
     def set_initial_brightness(self, brightness):
-        self._brightness = brightness
+        self._fixture.brightness = brightness
 
     @property
     def name(self):
@@ -229,7 +978,7 @@ class DmxBaseLight(LightEntity, RestoreEntity):
     @property
     def brightness(self):
         """Return the brightness of the light."""
-        return self._brightness
+        return self._fixture.brightness
 
     @property
     def color_mode(self) -> str | None:
@@ -241,26 +990,45 @@ class DmxBaseLight(LightEntity, RestoreEntity):
         """Flag supported features."""
         return self._features
 
+    def get_dmx_values(self) -> list:
+        return self._channel.get_channel_values()
+
+    @property
+    def dmx_channels(self) -> tuple:
+        """Return the DMX channels of the light, they are only needed for the state attributes"""
+        return dmx_channel_range(self._channel.start, self._channel.width)
+
+    def get_off_values(self) -> tuple | None:
+        """Return the DMX values of the light when it's off, None to use the target values"""
+        return (0,) * self._channel.width
+
     @property
     def extra_state_attributes(self):
-        data = {"type": self._type,
-                "dmx_channels": [
-                    k for k in range(
-                        self._channel.start, self._channel.start + self._channel.width, 1
-                    )
-                ],
-                "dmx_values": self._channel.get_channel_values(),
-                "values": self._vals,
-                "bright": self._brightness,
-                "transition": self._transition
-                }
-        self._channel_last_update = time.time()
+        fixture = self._fixture
+        dmx_values = self.get_dmx_values() if self._node_context.expose_dmx_values else None
+
+        # Only build new attributes if something changed
+        key = (dmx_values, fixture.values, fixture.brightness, fixture.transition)
+        if key == fixture.attributes_key:
+            return fixture.attributes
+
+        data = {"type": self.CONF_TYPE,
+                "dmx_channels": self.dmx_channels}
+        if dmx_values is not None:
+            data["dmx_values"] = dmx_values
+        data.update({"values": fixture.values,
+                     "bright": fixture.brightness,
+                     "transition": fixture.transition
+                     })
+
+        fixture.attributes = data
+        fixture.attributes_key = key
         return data
 
     @property
     def is_on(self):
         """Return true if light is on."""
-        return self._state
+        return self._fixture.is_on
 
     @property
     def should_poll(self):
@@ -273,71 +1041,102 @@ class DmxBaseLight(LightEntity, RestoreEntity):
 
     @property
     def fade_time(self):
-        return self._fade_time
+        return self._fixture.fade_time
 
     @fade_time.setter
     def fade_time(self, value):
-        self._fade_time = value
+        self._fixture.fade_time = value
+
+    def write_state(self):
+        """Write the state to Home Assistant through the publisher, so every write is counted"""
+        self._node_context.publisher.write(self)
 
-    def _channel_value_change(self, channel):
-        """Schedule update while fade is running"""
-        if time.time() - self._channel_last_update > 1.1:
-            self._channel_last_update = time.time()
-            self.async_schedule_update_ha_state()
+    def fade_started(self):
+        """Fade is started -> publish state updates while it's running"""
+        self._node_context.publisher.fade_started(self)
 
     def _channel_fade_finish(self, channel):
         """Fade is finished -> schedule update"""
-        self._channel_last_update = time.time()
-        self.async_schedule_update_ha_state()
+        self._node_context.publisher.fade_finished(self)
 
     def get_target_values(self) -> list:
         """Return the Target DMX Values"""
         raise NotImplementedError()
 
+    def values_received(self, channel):
+        """The values of the channel were set from outside -> take them over with the next state write"""
+        self._node_context.publisher.values_received(self)
+
+    def apply_dmx_values(self, values: list):
+        """Set the state of the light from the DMX values it currently has"""
+        pass
+
+    def _apply_brightness(self, values: list, brightness: float | None):
+        """The light is on if any channel is, the brightness stays as it is if it's unknown or off"""
+        fixture = self._fixture
+        fixture.is_on = any(values)
+        if fixture.is_on and brightness:
+            fixture.brightness = min(255, round(brightness))
+
+    def get_target_key(self) -> tuple:
+        """Return a key of everything the target values depend on, equal keys give equal values"""
+        vals = tuple(self._fixture.values) if isinstance(self._fixture.values, list) else self._fixture.values
+        return type(self), self._channel_size[2], self.is_on, self._fixture.brightness, vals
+
     async def async_create_fade(self, **kwargs):
         """Instruct the light to turn on"""
-        self._state = True
+        self._fixture.is_on = True
 
-        self._transition = kwargs.get(ATTR_TRANSITION, self._fade_time)
+        self._fixture.transition = kwargs.get(ATTR_TRANSITION, self._fixture.fade_time)
+        easing = EASINGS[kwargs.get(ATTR_EASING, self._fixture.easing)]
 
-        self._channel.add_fade(
-            self.get_target_values(), self._transition * 1000, pyartnet.fades.LinearFade
-        )
+        self._node_context.batch.add(self, self._fixture.transition, easing=easing)
 
-        self.async_schedule_update_ha_state()
+        self.write_state()
 
     async def async_turn_off(self, **kwargs):
         """
         Instruct the light to turn off. If a transition time has been specified in seconds
         the controller will fade.
         """
-        self._transition = kwargs.get(ATTR_TRANSITION, self._fade_time)
+        self._fixture.transition = kwargs.get(ATTR_TRANSITION, self._fixture.fade_time)
 
         logging.debug(
-            "Turning off '%s' with transition  %i", self._name, self._transition
-        )
-        self._channel.add_fade(
-            [0 for _ in range(self._channel.width)],
-            self._transition * 1000,
-            pyartnet.fades.LinearFade,
+            "Turning off '%s' with transition  %i", self._name, self._fixture.transition
         )
+        easing = EASINGS[kwargs.get(ATTR_EASING, self._fixture.easing)]
+        self._node_context.batch.add(self, self._fixture.transition, self.get_off_values(), easing)
 
-        self._state = False
-        self.async_schedule_update_ha_state()
+        self._fixture.is_on = False
+        self.write_state()
 
     async def async_added_to_hass(self) -> None:
         """Handle entity which will be added."""
         await super().async_added_to_hass()
+
+        data = self.hass.data[INTEGRATION_DOMAIN]
+        data[DATA_LIGHTS][self.entity_id] = self
+        data[DATA_NODES].acquire(self._node_context.node_id)
+        # The first light of the entry takes over the reference its setup held
+        if self._node_context.setup_reference:
+            self._node_context.setup_reference = False
+            await data[DATA_NODES].async_release(self._node_context.node_id)
+
         old_state = await self.async_get_last_state()
         if old_state:
             old_type = old_state.attributes.get('type')
-            if old_type != self._type:
+            if old_type != self.CONF_TYPE:
                 log.debug("Channel type changed. Unable to restore state.")
                 old_state = None
 
         if old_state is not None:
             await self.restore_state(old_state)
 
+    async def async_will_remove_from_hass(self) -> None:
+        data = self.hass.data[INTEGRATION_DOMAIN]
+        data[DATA_LIGHTS].pop(self.entity_id, None)
+        await data[DATA_NODES].async_release(self._node_context.node_id)
+
     async def restore_state(self, old_state):
         log.error("Derived class should implement this. Report this to the repository author.")
 
@@ -353,13 +1152,14 @@ class DmxBaseLight(LightEntity, RestoreEntity):
     def channel(self):
         return self._channel
 
+    @property
+    def stats(self) -> OutputStats | None:
+        return self._node_context.stats
+
 
 class DmxFixed(DmxBaseLight):
     CONF_TYPE = "fixed"
-
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
-        self._channel_width = 1
+    _color_mode = CONF_TYPE
 
     def get_target_values(self):
         return [self.brightness * self._channel_size[2]]
@@ -377,36 +1177,32 @@ class DmxFixed(DmxBaseLight):
 
 class DmxBinary(DmxBaseLight):
     CONF_TYPE = "binary"
-
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
-        self._channel_width = 1
-        self._supported_color_modes.add(COLOR_MODE_ONOFF)
-        self._color_mode = COLOR_MODE_ONOFF
+    _color_mode = COLOR_MODE_ONOFF
+    _supported_color_modes = {COLOR_MODE_ONOFF}
 
     def get_target_values(self):
         return [self.brightness * self._channel_size[2]]
 
+    def apply_dmx_values(self, values):
+        self._fixture.is_on = values[0] > 0
+        self._fixture.brightness = 255 if self._fixture.is_on else 0
+
     async def async_turn_on(self, **kwargs):
-        self._state = True
-        self._brightness = 255
-        self._channel.add_fade(
-            self.get_target_values(), 0, pyartnet.fades.LinearFade
-        )
-        self.async_schedule_update_ha_state()
+        self._fixture.is_on = True
+        self._fixture.brightness = 255
+        self._node_context.batch.add(self, 0)
+        self.write_state()
 
     async def async_turn_off(self, **kwargs):
-        self._state = False
-        self._brightness = 0
-        self._channel.add_fade(
-            self.get_target_values(), 0, pyartnet.fades.LinearFade
-        )
-        self.async_schedule_update_ha_state()
+        self._fixture.is_on = False
+        self._fixture.brightness = 0
+        self._node_context.batch.add(self, 0)
+        self.write_state()
 
     async def restore_state(self, old_state):
         log.debug("Added binary light to hass. Try restoring state.")
-        self._state = old_state.state
-        self._brightness = old_state.attributes.get('bright')
+        self._fixture.is_on = old_state.state
+        self._fixture.brightness = old_state.attributes.get('bright')
 
         if old_state.state == STATE_ON:
             await self.async_turn_on()
@@ -416,22 +1212,21 @@ class DmxBinary(DmxBaseLight):
 
 class DmxDimmer(DmxBaseLight):
     CONF_TYPE = "dimmer"
-
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
-        self._channel_width = 1
-        self._supported_color_modes.add(COLOR_MODE_BRIGHTNESS)
-        self._features = SUPPORT_TRANSITION
-        self._color_mode = COLOR_MODE_BRIGHTNESS
+    _color_mode = COLOR_MODE_BRIGHTNESS
+    _supported_color_modes = {COLOR_MODE_BRIGHTNESS}
+    _features = SUPPORT_TRANSITION
 
     def get_target_values(self):
         return [self.brightness * self._channel_size[2]]
 
+    def apply_dmx_values(self, values):
+        self._apply_brightness(values, values[0] / self._channel_size[2])
+
     async def async_turn_on(self, **kwargs):
 
         # Update state from service call
         if ATTR_BRIGHTNESS in kwargs:
-            self._brightness = kwargs[ATTR_BRIGHTNESS]
+            self._fixture.brightness = kwargs[ATTR_BRIGHTNESS]
 
         await super().async_create_fade(**kwargs)
 
@@ -440,33 +1235,51 @@ class DmxDimmer(DmxBaseLight):
 
         if old_state:
             prev_brightness = old_state.attributes.get('bright')
-            self._brightness = prev_brightness
+            self._fixture.brightness = prev_brightness
 
         if old_state.state != STATE_OFF:
-            await super().async_create_fade(brightness=self._brightness, transition=0)
+            await super().async_create_fade(brightness=self._fixture.brightness, transition=0)
 
 
 class DmxWhite(DmxBaseLight):
     CONF_TYPE = "color_temp"
 
+    # d = dimmer
+    # c = cool (scaled for brightness)
+    # C = cool (not scaled)
+    # h = hot (scaled for brightness)
+    # H = hot (not scaled)
+    # t = temperature (0 = hot, 255 = cold)
+    # T = temperature (255 = hot, 0 = cold)
+    CHANNEL_OPERATIONS = {
+        "d": (OP_DIMMER, 0),
+        "c": (OP_FRACTION_SCALED, 0),
+        "C": (OP_UNSCALED, 0),
+        "h": (OP_FRACTION_SCALED, 1),
+        "H": (OP_UNSCALED, 1),
+        "t": (OP_TEMP, 0),
+        "T": (OP_TEMP_INVERTED, 0),
+    }
+
+    _color_mode = COLOR_MODE_COLOR_TEMP
+    _supported_color_modes = {COLOR_MODE_COLOR_TEMP, COLOR_MODE_WHITE}
+    _features = SUPPORT_TRANSITION
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self._supported_color_modes.add(COLOR_MODE_COLOR_TEMP)
-        self._supported_color_modes.add(COLOR_MODE_WHITE)
-        self._features = SUPPORT_TRANSITION
-        self._color_mode = COLOR_MODE_COLOR_TEMP
         # Intentionally switching min and max here; it's inverted in the conversion.
         self._min_mireds = convert_to_mireds(kwargs[CONF_DEVICE_MAX_TEMP])
         self._max_mireds = convert_to_mireds(kwargs[CONF_DEVICE_MIN_TEMP])
-        self._vals = (self._max_mireds + self._min_mireds) / 2 or 300
+        self._fixture.values = (self._max_mireds + self._min_mireds) / 2 or 300
 
-        self._channel_setup = kwargs.get(CONF_CHANNEL_SETUP) or "ch"
-        self._channel_width = len(self._channel_setup)
+        channel_setup = kwargs.get(CONF_CHANNEL_SETUP) or "ch"
+        self._channel_width = len(channel_setup)
+        self._channel_ops = ChannelSetup.get(channel_setup, self.CHANNEL_OPERATIONS, self._channel_size[2])
 
     @property
     def color_temp(self) -> int:
         """Return the CT color temperature."""
-        return self._vals
+        return self._fixture.values
 
     @property
     def min_mireds(self) -> int:
@@ -478,51 +1291,37 @@ class DmxWhite(DmxBaseLight):
         """Return the warmest color_temp that this light supports."""
         return self._max_mireds
 
-    def get_target_values(self):
-        # d = dimmer
-        # c = cool (scaled for brightness)
-        # C = cool (not scaled)
-        # h = hot (scaled for brightness)
-        # H = hot (not scaled)
-        # t = temperature (0 = hot, 255 = cold)
-        # T = temperature (255 = hot, 0 = cold)
+    def get_target_key(self) -> tuple:
+        return super().get_target_key() + (self._channel_ops, self._min_mireds, self._max_mireds)
 
+    def get_target_values(self):
         ww_fraction = (self.color_temp - self.min_mireds) \
                       / (self.max_mireds - self.min_mireds)
         cw_fraction = 1 - ww_fraction
         max_fraction = max(ww_fraction, cw_fraction)
 
-        switcher = {
-            "d": lambda: self._brightness,
-            "c": lambda: self.is_on * self._brightness * (cw_fraction / max_fraction),
-            "C": lambda: self.is_on * cw_fraction * 255 / max_fraction,
-            "h": lambda: self.is_on * self._brightness * (ww_fraction / max_fraction),
-            "H": lambda: self.is_on * ww_fraction * 255 / max_fraction,
-            "t": lambda: 255 - (ww_fraction * 255),
-            "T": lambda: ww_fraction * 255
-        }
+        return self._channel_ops.render(
+            self.is_on, self._fixture.brightness, (cw_fraction, ww_fraction), max_fraction, ww_fraction
+        )
 
-        values = list()
-        for channel in self._channel_setup:
-            calculation_function = switcher.get(channel, lambda: 0)
-            value = calculation_function()
-            if value < 0 or value > 256:
-                log.warning(f"Value for channel {channel} isn't within bound: {value}")
-                value = max(0, min(256, value))
-            values.append(int(round(value * self._channel_size[2])))
+    def apply_dmx_values(self, values):
+        brightness, (cold, warm), temperature = self._channel_ops.parse(values, 2)
+        self._apply_brightness(values, brightness)
 
-        return values
+        if temperature is None and cold + warm > 0:
+            temperature = warm / (cold + warm)
+        if temperature is not None:
+            self._fixture.values = round(self.min_mireds + temperature * (self.max_mireds - self.min_mireds))
 
     async def async_turn_on(self, **kwargs):
         """
         Instruct the light to turn on.
         """
         if ATTR_COLOR_TEMP in kwargs:
-            self._vals = kwargs[ATTR_COLOR_TEMP]
+            self._fixture.values = kwargs[ATTR_COLOR_TEMP]
 
         if ATTR_BRIGHTNESS in kwargs:
-            self._brightness = kwargs[ATTR_BRIGHTNESS]
-            self._scale_factor = self._brightness / 255
+            self._fixture.brightness = kwargs[ATTR_BRIGHTNESS]
 
         await super().async_create_fade(**kwargs)
         return None
@@ -532,76 +1331,153 @@ class DmxWhite(DmxBaseLight):
 
         if old_state:
             prev_vals = old_state.attributes.get('values')
-            self._vals = prev_vals
+            self._fixture.values = prev_vals
             prev_brightness = old_state.attributes.get('bright')
-            self._brightness = prev_brightness
+            self._fixture.brightness = prev_brightness
 
         if old_state.state != STATE_OFF:
-            await super().async_create_fade(brightness=self._brightness, rgb_color=self._vals, transition=0)
+            await super().async_create_fade(
+                brightness=self._fixture.brightness, rgb_color=self._fixture.values, transition=0
+            )
+
+
+class DmxEffectLight(DmxBaseLight):
+    """
+    Color light which can run the effects of EFFECTS. An effect is rendered into the channel of the
+    light every frame by the output loop, until the light gets a new color or is turned off.
+    """
+
+    _attr_effect_list = list(EFFECTS)
+
+    @property
+    def pixel_count(self) -> int:
+        return 1
+
+    @property
+    def effect(self) -> str | None:
+        renderer = self._fixture.effect
+        if renderer is None or self._channel.effect is not renderer:
+            return None
+        return renderer.effect.name
+
+    def effect_color(self) -> tuple:
+        """Return the current color as rgb, effects are based on it"""
+        raise NotImplementedError()
+
+    def render_color(self, color: tuple) -> list:
+        """Return the DMX values of one pixel with the given rgb color at the current brightness"""
+        raise NotImplementedError()
+
+    def start_effect(self, name: str, start: float | None = None, phase: float = 0.0, span: float = 1.0):
+        """Run an effect, lights which run it together pass the same start and consecutive phases"""
+        effect = EFFECTS[name]
+        palette = [self.render_color(color) for color in effect.palette(self.effect_color())]
+        self._fixture.effect = EffectRenderer(effect, palette, self.pixel_count, start, phase, span)
+        self._node_context.batch.discard(self)
+        self._channel.set_effect(self._fixture.effect)
+        self._fixture.is_on = True
+
+    async def async_create_fade(self, **kwargs):
+        effect = kwargs.get(ATTR_EFFECT)
+        if effect in (self.effect_list or ()):
+            self.start_effect(effect)
+            self.write_state()
+            return None
+
+        # Only the brightness changed, keep the effect running with the new brightness
+        renderer = self._fixture.effect
+        if effect is None and self.effect is not None and not any(attr in kwargs for attr in COLOR_ATTRIBUTES):
+            self.start_effect(renderer.effect.name, renderer.start, renderer.phase, renderer.span)
+            self.write_state()
+            return None
+
+        self._fixture.effect = None
+        await super().async_create_fade(**kwargs)
+
+    async def async_turn_off(self, **kwargs):
+        self._fixture.effect = None
+        await super().async_turn_off(**kwargs)
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+
+        old_state = await self.async_get_last_state()
+        if old_state is not None and old_state.state == STATE_ON and old_state.attributes.get(ATTR_EFFECT) in EFFECTS:
+            self.start_effect(old_state.attributes[ATTR_EFFECT])
 
 
-class DmxRGB(DmxBaseLight):
+class DmxRGB(DmxEffectLight):
     CONF_TYPE = "rgb"
 
+    # d = dimmer
+    # r = red (scaled for brightness)
+    # R = red (not scaled)
+    # g = green (scaled for brightness)
+    # G = green (not scaled)
+    # b = blue (scaled for brightness)
+    # B = blue (not scaled)
+    # w = white (automatically calculated, scaled for brightness)
+    # W = white (automatically calculated, not scaled)
+    CHANNEL_OPERATIONS = {
+        "d": (OP_DIMMER, 0),
+        "r": (OP_SCALED, 0),
+        "R": (OP_UNSCALED, 0),
+        "g": (OP_SCALED, 1),
+        "G": (OP_UNSCALED, 1),
+        "b": (OP_SCALED, 2),
+        "B": (OP_UNSCALED, 2),
+        "w": (OP_SCALED, 3),
+        "W": (OP_UNSCALED, 3),
+    }
+
+    _color_mode = COLOR_MODE_RGB
+    _supported_color_modes = {COLOR_MODE_RGB}
+    _features = SUPPORT_TRANSITION | SUPPORT_EFFECT
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self._supported_color_modes.add(COLOR_MODE_RGB)
-        self._features = SUPPORT_TRANSITION
-        self._color_mode = COLOR_MODE_RGB
-        self._vals = (255, 255, 255)
-
-        self._channel_setup = kwargs.get(CONF_CHANNEL_SETUP) or "rgb"
-        self._channel_width = len(self._channel_setup)
+        self._fixture.values = (255, 255, 255)
 
-        self._auto_scale_white = "w" in self._channel_setup or "W" in self._channel_setup
+        channel_setup = kwargs.get(CONF_CHANNEL_SETUP) or "rgb"
+        self._channel_width = len(channel_setup)
+        self._channel_ops = ChannelSetup.get(channel_setup, self.CHANNEL_OPERATIONS, self._channel_size[2])
 
     @property
     def rgb_color(self) -> tuple:
         """Return the rgb color value."""
-        return self._vals
+        return self._fixture.values
+
+    def effect_color(self) -> tuple:
+        return tuple(self._fixture.values)
+
+    def render_color(self, color: tuple) -> list:
+        vals = color
+        if self._channel_ops.has_white:
+            vals = cached_rgb_to_rgbw(*color)
+        return self._channel_ops.render(True, self._fixture.brightness, vals, 255)
+
+    def get_target_key(self) -> tuple:
+        return super().get_target_key() + (self._channel_ops,)
 
     def get_target_values(self):
-        # d = dimmer
-        # r = red (scaled for brightness)
-        # R = red (not scaled)
-        # g = green (scaled for brightness)
-        # G = green (not scaled)
-        # b = blue (scaled for brightness)
-        # B = blue (not scaled)
-        # w = white (automatically calculated, scaled for brightness)
-        # W = white (automatically calculated, not scaled)
-
-        red = self._vals[0]
-        green = self._vals[1]
-        blue = self._vals[2]
-
-        if self._auto_scale_white:
-            red, green, blue, white = color_rgb_to_rgbw(red, green, blue)
-
-        max_color = max(1, max(self._vals))
-
-        switcher = {
-            "d": lambda: self._brightness,
-            "r": lambda: self.is_on * red * self._brightness / max_color,
-            "R": lambda: self.is_on * red * 255 / max_color,
-            "g": lambda: self.is_on * green * self._brightness / max_color,
-            "G": lambda: self.is_on * green * 255 / max_color,
-            "b": lambda: self.is_on * blue * self._brightness / max_color,
-            "B": lambda: self.is_on * blue * 255 / max_color,
-            "w": lambda: self.is_on * white * self._brightness / max_color,
-            "W": lambda: self.is_on * white * 255 / max_color
-        }
+        vals = self._fixture.values
+        if self._channel_ops.has_white:
+            vals = cached_rgb_to_rgbw(*vals[:3])
 
-        values = list()
-        for channel in self._channel_setup:
-            calculation_function = switcher.get(channel, lambda: 0)
-            value = calculation_function()
-            if value < 0 or value > 256:
-                log.warning(f"Value for channel {channel} isn't within bound: {value}")
-                value = max(0, min(256, value))
-            values.append(int(round(value * self._channel_size[2])))
+        max_color = max(1, max(self._fixture.values))
 
-        return values
+        return self._channel_ops.render(self.is_on, self._fixture.brightness, vals, max_color)
+
+    def apply_dmx_values(self, values):
+        brightness, vals, _ = self._channel_ops.parse(values, 4)
+        self._apply_brightness(values, brightness)
+
+        # An off light keeps its color
+        if self.is_on:
+            if self._channel_ops.has_white:
+                self._fixture.values = color_util.color_rgbw_to_rgb(*vals)
+            else:
+                self._fixture.values = tuple(round(value) for value in vals[:3])
 
     async def async_turn_on(self, **kwargs):
         """
@@ -610,11 +1486,10 @@ class DmxRGB(DmxBaseLight):
 
         # RGB already contains brightness information
         if ATTR_RGB_COLOR in kwargs:
-            self._vals = kwargs[ATTR_RGB_COLOR]
+            self._fixture.values = kwargs[ATTR_RGB_COLOR]
 
         if ATTR_BRIGHTNESS in kwargs:
-            self._brightness = kwargs[ATTR_BRIGHTNESS]
-            self._scale_factor = self._brightness / 255
+            self._fixture.brightness = kwargs[ATTR_BRIGHTNESS]
 
         await super().async_create_fade(**kwargs)
         return None
@@ -624,73 +1499,76 @@ class DmxRGB(DmxBaseLight):
 
         if old_state:
             prev_vals = old_state.attributes.get('values')
-            self._vals = prev_vals
+            self._fixture.values = prev_vals
             prev_brightness = old_state.attributes.get('bright')
-            self._brightness = prev_brightness
+            self._fixture.brightness = prev_brightness
 
         if old_state.state != STATE_OFF:
-            await super().async_create_fade(brightness=self._brightness, rgb_color=self._vals, transition=0)
+            await super().async_create_fade(
+                brightness=self._fixture.brightness, rgb_color=self._fixture.values, transition=0
+            )
 
 
-class DmxRGBW(DmxBaseLight):
+class DmxRGBW(DmxEffectLight):
     CONF_TYPE = "rgbw"
 
+    # d = dimmer
+    # r = red (scaled for brightness)
+    # R = red (not scaled)
+    # g = green (scaled for brightness)
+    # G = green (not scaled)
+    # b = blue (scaled for brightness)
+    # B = blue (not scaled)
+    # w = white (scaled for brightness)
+    # W = white (not scaled)
+    CHANNEL_OPERATIONS = {
+        "d": (OP_DIMMER, 0),
+        "r": (OP_SCALED, 0),
+        "R": (OP_UNSCALED, 0),
+        "g": (OP_SCALED, 1),
+        "G": (OP_UNSCALED, 1),
+        "b": (OP_SCALED, 2),
+        "B": (OP_UNSCALED, 2),
+        "w": (OP_SCALED, 3),
+        "W": (OP_UNSCALED, 3),
+    }
+
+    _color_mode = COLOR_MODE_RGBW
+    _supported_color_modes = {COLOR_MODE_RGBW}
+    _features = SUPPORT_TRANSITION | SUPPORT_EFFECT
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self._supported_color_modes.add(COLOR_MODE_RGBW)
-        self._features = SUPPORT_TRANSITION
-        self._color_mode = COLOR_MODE_RGBW
-        self._vals = (255, 255, 255, 255)
+        self._fixture.values = (255, 255, 255, 255)
 
-        self._channel_setup = kwargs.get(CONF_CHANNEL_SETUP) or "rgbw"
-        self._channel_width = len(self._channel_setup)
+        channel_setup = kwargs.get(CONF_CHANNEL_SETUP) or "rgbw"
+        self._channel_width = len(channel_setup)
+        self._channel_ops = ChannelSetup.get(channel_setup, self.CHANNEL_OPERATIONS, self._channel_size[2])
 
     @property
     def rgbw_color(self) -> tuple:
         """Return the rgbw color value."""
-        return self._vals
+        return self._fixture.values
+
+    def effect_color(self) -> tuple:
+        return color_util.color_rgbw_to_rgb(*self._fixture.values)
+
+    def render_color(self, color: tuple) -> list:
+        return self._channel_ops.render(True, self._fixture.brightness, cached_rgb_to_rgbw(*color), 255)
+
+    def get_target_key(self) -> tuple:
+        return super().get_target_key() + (self._channel_ops,)
 
     def get_target_values(self):
-        # d = dimmer
-        # r = red (scaled for brightness)
-        # R = red (not scaled)
-        # g = green (scaled for brightness)
-        # G = green (not scaled)
-        # b = blue (scaled for brightness)
-        # B = blue (not scaled)
-        # w = white (scaled for brightness)
-        # W = white (not scaled)
-
-        red = self._vals[0]
-        green = self._vals[1]
-        blue = self._vals[2]
-        white = self._vals[3]
-
-        max_color = max(1, max(self._vals))
-
-        switcher = {
-            "d": lambda: self._brightness,
-            "r": lambda: self.is_on * red * self._brightness / max_color,
-            "R": lambda: self.is_on * red * 255 / max_color,
-            "g": lambda: self.is_on * green * self._brightness / max_color,
-            "G": lambda: self.is_on * green * 255 / max_color,
-            "b": lambda: self.is_on * blue * self._brightness / max_color,
-            "B": lambda: self.is_on * blue * 255 / max_color,
-            "w": lambda: self.is_on * white * self._brightness / max_color,
-            "W": lambda: self.is_on * white * 255 / max_color,
-        }
+        max_color = max(1, max(self._fixture.values))
 
-        values = list()
-        for channel in self._channel_setup:
-            calculation_function = switcher.get(channel, lambda: 0)
-            log.info(f"DEBUGGY for {channel}: {calculation_function()}")
-            value = calculation_function()
-            if value < 0 or value > 256:
-                log.warning(f"Value for channel {channel} isn't within bound: {value}")
-                value = max(0, min(256, value))
-            values.append(int(round(value * self._channel_size[2])))
+        return self._channel_ops.render(self.is_on, self._fixture.brightness, self._fixture.values, max_color)
 
-        return values
+    def apply_dmx_values(self, values):
+        brightness, vals, _ = self._channel_ops.parse(values, 4)
+        self._apply_brightness(values, brightness)
+        if self.is_on:
+            self._fixture.values = tuple(round(value) for value in vals)
 
     async def async_turn_on(self, **kwargs):
         """
@@ -698,12 +1576,10 @@ class DmxRGBW(DmxBaseLight):
         """
         # RGB already contains brightness information
         if ATTR_RGBW_COLOR in kwargs:
-            self._vals = kwargs[ATTR_RGBW_COLOR]
-            # self._scale_factor = 1
+            self._fixture.values = kwargs[ATTR_RGBW_COLOR]
 
         if ATTR_BRIGHTNESS in kwargs:
-            self._brightness = kwargs[ATTR_BRIGHTNESS]
-            self._scale_factor = self._brightness / 255
+            self._fixture.brightness = kwargs[ATTR_BRIGHTNESS]
 
         await super().async_create_fade(**kwargs)
         return None
@@ -713,35 +1589,68 @@ class DmxRGBW(DmxBaseLight):
 
         if old_state:
             prev_vals = old_state.attributes.get('values')
-            self._vals = prev_vals
+            self._fixture.values = prev_vals
 
             prev_brightness = old_state.attributes.get('bright')
-            self._brightness = prev_brightness
+            self._fixture.brightness = prev_brightness
 
         if old_state.state != STATE_OFF:
-            await super().async_create_fade(brightness=self._brightness, rgbw_color=self._vals, transition=0)
+            await super().async_create_fade(
+                brightness=self._fixture.brightness, rgbw_color=self._fixture.values, transition=0
+            )
 
 
 class DmxRGBWW(DmxBaseLight):
     CONF_TYPE = "rgbww"
 
+    # d = dimmer
+    # r = red (scaled for brightness)
+    # R = red (not scaled)
+    # g = green (scaled for brightness)
+    # G = green (not scaled)
+    # b = blue (scaled for brightness)
+    # B = blue (not scaled)
+    # c = cool (scaled for brightness)
+    # C = cool (not scaled)
+    # h = hot (scaled for brightness)
+    # H = hot (not scaled)
+    # t = temperature (0 = hot, 255 = cold)
+    # T = temperature (255 = hot, 0 = cold)
+    CHANNEL_OPERATIONS = {
+        "d": (OP_DIMMER, 0),
+        "r": (OP_SCALED, 0),
+        "R": (OP_UNSCALED, 0),
+        "g": (OP_SCALED, 1),
+        "G": (OP_UNSCALED, 1),
+        "b": (OP_SCALED, 2),
+        "B": (OP_UNSCALED, 2),
+        "c": (OP_SCALED, 3),
+        "C": (OP_UNSCALED, 3),
+        "h": (OP_SCALED, 4),
+        "H": (OP_UNSCALED, 4),
+        "t": (OP_TEMP, 0),
+        "T": (OP_TEMP_INVERTED, 0),
+    }
+
+    _color_mode = COLOR_MODE_RGBWW
+    _supported_color_modes = {COLOR_MODE_RGBWW}
+    _features = SUPPORT_TRANSITION
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self._supported_color_modes.add(COLOR_MODE_RGBWW)
-        self._features = SUPPORT_TRANSITION
-        self._color_mode = COLOR_MODE_RGBWW
         # Intentionally switching min and max here; it's inverted in the conversion.
         self._min_mireds = convert_to_mireds(kwargs[CONF_DEVICE_MAX_TEMP])
         self._max_mireds = convert_to_mireds(kwargs[CONF_DEVICE_MIN_TEMP])
-        self._vals = (255, 255, 255, 255, 255)
+        self._fixture.values = (255, 255, 255, 255, 255)
 
-        self._channel_setup = kwargs.get(CONF_CHANNEL_SETUP) or "rgbch"
-        self._channel_width = len(self._channel_setup)
+        channel_setup = kwargs.get(CONF_CHANNEL_SETUP) or "rgbch"
+        self._channel_width = len(channel_setup)
+        self._channel_ops = ChannelSetup.get(channel_setup, self.CHANNEL_OPERATIONS, self._channel_size[2])
 
     @property
     def rgbww_color(self) -> tuple:
         """Return the rgbww color value."""
-        return self._vals
+        return self._fixture.values
 
     @property
     def min_mireds(self) -> int:
@@ -755,57 +1664,32 @@ class DmxRGBWW(DmxBaseLight):
 
     @property
     def color_temp(self) -> int | None:
-        return color_util.rgbww_to_color_temperature(self._vals, self.min_mireds, self.max_mireds)[0]
+        return cached_rgbww_to_color_temperature(tuple(self._fixture.values), self.min_mireds, self.max_mireds)[0]
+
+    def get_target_key(self) -> tuple:
+        return super().get_target_key() + (self._channel_ops, self._min_mireds, self._max_mireds)
 
     def get_target_values(self):
-        # d = dimmer
-        # r = red (scaled for brightness)
-        # R = red (not scaled)
-        # g = green (scaled for brightness)
-        # G = green (not scaled)
-        # b = blue (scaled for brightness)
-        # B = blue (not scaled)
-        # c = cool (scaled for brightness)
-        # C = cool (not scaled)
-        # h = hot (scaled for brightness)
-        # H = hot (not scaled)
-        # t = temperature (0 = hot, 255 = cold)
-        # T = temperature (255 = hot, 0 = cold)
-
-        red = self._vals[0]
-        green = self._vals[1]
-        blue = self._vals[2]
-        cold_white = self._vals[3]
-        warm_white = self._vals[4]
-
-        max_color = max(1, max(self._vals))
-
-        switcher = {
-            "d": lambda: self._brightness,
-            "r": lambda: self.is_on * red * self._brightness / max_color,
-            "R": lambda: self.is_on * red * 255 / max_color,
-            "g": lambda: self.is_on * green * self._brightness / max_color,
-            "G": lambda: self.is_on * green * 255 / max_color,
-            "b": lambda: self.is_on * blue * self._brightness / max_color,
-            "B": lambda: self.is_on * blue * 255 / max_color,
-            "c": lambda: self.is_on * cold_white * self._brightness / max_color,
-            "C": lambda: self.is_on * cold_white * 255 / max_color,
-            "h": lambda: self.is_on * warm_white * self._brightness / max_color,
-            "H": lambda: self.is_on * warm_white * 255 / max_color,
-            "t": lambda: 255 - ((self.color_temp - self.min_mireds) / (self.max_mireds - self.min_mireds) * 255),
-            "T": lambda: (self.color_temp - self.min_mireds) / (self.max_mireds - self.min_mireds) * 255
-        }
+        max_color = max(1, max(self._fixture.values))
 
-        values = list()
-        for channel in self._channel_setup:
-            calculation_function = switcher.get(channel, lambda: 0)
-            value = calculation_function()
-            if value < 0 or value > 256:
-                log.warning(f"Value for channel {channel} isn't within bound: {value}")
-                value = max(0, min(256, value))
-            values.append(int(round(value * self._channel_size[2])))
+        temperature = 0.0
+        if self._channel_ops.uses_temperature:
+            temperature = (self.color_temp - self.min_mireds) / (self.max_mireds - self.min_mireds)
 
-        return values
+        return self._channel_ops.render(
+            self.is_on, self._fixture.brightness, self._fixture.values, max_color, temperature
+        )
+
+    def apply_dmx_values(self, values):
+        brightness, vals, temperature = self._channel_ops.parse(values, 5)
+        self._apply_brightness(values, brightness)
+        if not self.is_on:
+            return None
+
+        # Without white channels the temperature channel tells the mix of the whites
+        if temperature is not None and not (vals[3] or vals[4]):
+            vals[3], vals[4] = (1 - temperature) * 255, temperature * 255
+        self._fixture.values = tuple(round(value) for value in vals)
 
     async def async_turn_on(self, **kwargs):
         """
@@ -814,12 +1698,10 @@ class DmxRGBWW(DmxBaseLight):
 
         # RGB already contains brightness information
         if ATTR_RGBWW_COLOR in kwargs:
-            self._vals = kwargs[ATTR_RGBWW_COLOR]
-            # self._scale_factor = 1
+            self._fixture.values = kwargs[ATTR_RGBWW_COLOR]
 
         if ATTR_BRIGHTNESS in kwargs:
-            self._brightness = kwargs[ATTR_BRIGHTNESS]
-            self._scale_factor = self._brightness / 255
+            self._fixture.brightness = kwargs[ATTR_BRIGHTNESS]
 
         await super().async_create_fade(**kwargs)
         return None
@@ -829,34 +1711,246 @@ class DmxRGBWW(DmxBaseLight):
 
         if old_state:
             prev_vals = old_state.attributes.get('values')
-            self._vals = prev_vals
+            self._fixture.values = prev_vals
 
             prev_brightness = old_state.attributes.get('bright')
-            self._brightness = prev_brightness
-            self._scale_factor = self._brightness / 255
+            self._fixture.brightness = prev_brightness
 
         if old_state.state != STATE_OFF:
-            await super().async_create_fade(brightness=self._brightness, rgbww_color=self._vals, transition=0)
+            await super().async_create_fade(
+                brightness=self._fixture.brightness, rgbww_color=self._fixture.values, transition=0
+            )
+
+
+class DmxPixelStrip(DmxRGB):
+    """
+    A number of identical RGB fixtures on contiguous channels, e.g. the pixels of a LED strip. All pixels
+    share one channel, and thus one fade and one value buffer, and are rendered by repeating the values
+    of a single pixel. Optionally the strip is split into segments, which are lights of their own.
+    """
+
+    CONF_TYPE = "pixel_strip"
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._pixels = kwargs[CONF_DEVICE_PIXELS]
+        self._channel_width *= self._pixels
+
+        self._segments = []
+        segments = min(kwargs[CONF_DEVICE_SEGMENTS], self._pixels)
+        first_pixel = 0
+        for i in range(segments):
+            pixel_count = self._pixels // segments + (i < self._pixels % segments)
+            segment_kwargs = dict(kwargs)
+            segment_kwargs[CONF_DEVICE_NAME] = f"{kwargs[CONF_DEVICE_NAME]} segment {i + 1}"
+            segment_kwargs["unique_id"] = f"{kwargs['unique_id']}/segment/{i + 1}"
+            self._segments.append(DmxPixelSegment(self, first_pixel, pixel_count, **segment_kwargs))
+            first_pixel += pixel_count
+
+    @property
+    def segments(self) -> list[DmxPixelSegment]:
+        return self._segments
+
+    @property
+    def pixel_width(self) -> int:
+        return len(self._channel_ops)
+
+    @property
+    def pixel_count(self) -> int:
+        return self._pixels
+
+    def render_pixel(self) -> list:
+        """Return the DMX values of one pixel"""
+        if not self.is_on:
+            return [0] * self.pixel_width
+        return DmxRGB.get_target_values(self)
+
+    def get_target_key(self) -> tuple:
+        key = super().get_target_key() + (self._pixels,)
+        if self._segments:
+            key += tuple(segment.get_pixel_key() for segment in self._segments)
+        return key
+
+    def values_received(self, channel):
+        publisher = self._node_context.publisher
+        publisher.values_received(self)
+        for segment in self._segments:
+            publisher.values_received(segment)
+
+    def apply_dmx_values(self, values):
+        # The first pixel stands for the whole strip
+        super().apply_dmx_values(values[:self.pixel_width])
+
+    def get_target_values(self):
+        if not self._segments:
+            return self.render_pixel() * self._pixels
+
+        values = []
+        for segment in self._segments:
+            values += segment.render_pixel() * segment.pixels
+        return values
+
+    async def async_turn_on(self, **kwargs):
+        await super().async_turn_on(**kwargs)
+        self._update_segments()
+
+    async def async_turn_off(self, **kwargs):
+        await super().async_turn_off(**kwargs)
+        self._update_segments()
+
+    def _update_segments(self):
+        """The whole strip was set, so all segments take over its state"""
+        for segment in self._segments:
+            segment.follow(self)
+
+    def fade_started(self):
+        publisher = self._node_context.publisher
+        publisher.fade_started(self)
+        for segment in self._segments:
+            publisher.fade_started(segment)
+
+    def _channel_fade_finish(self, channel):
+        publisher = self._node_context.publisher
+        publisher.fade_finished(self)
+        for segment in self._segments:
+            publisher.fade_finished(segment)
+
+
+class DmxPixelSegment(DmxRGB):
+    """
+    A part of a pixel strip. It has no channel of its own: it renders its pixels into the channel of the
+    strip, which fades all segments at once.
+    """
+
+    CONF_TYPE = DmxPixelStrip.CONF_TYPE
+
+    # Effects run on the whole strip
+    _features = SUPPORT_TRANSITION
+    _attr_effect_list = None
+
+    def __init__(self, strip: DmxPixelStrip, first_pixel: int, pixel_count: int, **kwargs):
+        super().__init__(**kwargs)
+        self._strip = strip
+        self._pixels = pixel_count
+        self._offset = first_pixel * self._channel_width
+        self._channel_width *= pixel_count
+
+    @property
+    def pixels(self) -> int:
+        return self._pixels
+
+    def set_channel(self, channel):
+        """Use the channel of the strip, its callbacks stay with the strip"""
+        self._channel = channel
+
+    @property
+    def dmx_channels(self) -> tuple:
+        # The offset counts values, a value of a 16 bit or wider channel takes several DMX channels
+        return dmx_channel_range(self._channel.start + self._offset * self._channel_size[0], self._channel_width)
+
+    def get_off_values(self) -> tuple | None:
+        # Turning off renders the whole strip, with this segment off
+        return None
+
+    def get_dmx_values(self) -> list:
+        return self._channel.get_channel_values()[self._offset:self._offset + self._channel_width]
+
+    def apply_dmx_values(self, values):
+        super().apply_dmx_values(values[:len(self._channel_ops)])
+
+    def get_pixel_key(self) -> tuple:
+        return DmxRGB.get_target_key(self)
+
+    def render_pixel(self) -> list:
+        if not self.is_on:
+            return [0] * (self._channel_width // self._pixels)
+        return DmxRGB.get_target_values(self)
+
+    # The target of a segment is the target of the whole strip
+    def get_target_key(self) -> tuple:
+        return self._strip.get_target_key()
+
+    def get_target_values(self):
+        return self._strip.get_target_values()
+
+    def follow(self, strip: DmxPixelStrip):
+        """Take over the state of the strip"""
+        self._fixture.is_on = strip.is_on
+        self._fixture.values = strip.rgb_color
+        self._fixture.brightness = strip.brightness
+        self._fixture.transition = strip._fixture.transition
+        if self.hass is not None:
+            self.write_state()
+
+    def fade_started(self):
+        self._strip.fade_started()
 
 
 # ------------------------------------------------------------------------------
 # conf
 # ------------------------------------------------------------------------------
 
-__CLASS_LIST = [DmxDimmer, DmxRGB, DmxWhite, DmxRGBW, DmxRGBWW, DmxBinary, DmxFixed]
+__CLASS_LIST = [DmxDimmer, DmxRGB, DmxWhite, DmxRGBW, DmxRGBWW, DmxBinary, DmxFixed, DmxPixelStrip]
 __CLASS_TYPE = {k.CONF_TYPE: k for k in __CLASS_LIST}
 
-PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend(
+OUTPUT_CORRECTION_SCHEMA = vol.Any(
+    None,
+    vol.In(AVAILABLE_CORRECTIONS),
+    vol.All(vol.Coerce(float), vol.Range(min=0.1, max=10)),
+    vol.All([vol.All(vol.Coerce(float), vol.Range(min=0, max=1))], vol.Length(min=2)),
+)
+
+
+def validate_device_type(device: dict) -> dict:
+    """Check the device options which only apply to some types, and fill in their defaults"""
+    if device[CONF_DEVICE_TYPE] == DmxPixelStrip.CONF_TYPE:
+        device.setdefault(CONF_DEVICE_PIXELS, 1)
+        device.setdefault(CONF_DEVICE_SEGMENTS, 0)
+    else:
+        for key in (CONF_DEVICE_PIXELS, CONF_DEVICE_SEGMENTS):
+            if key in device:
+                raise vol.Invalid(f"{key} only applies to {DmxPixelStrip.CONF_TYPE}, not {device[CONF_DEVICE_TYPE]}")
+    return device
+
+
+def validate_node_protocol(config: dict) -> dict:
+    """Check the node options which depend on the protocol, and fill in the default port of the protocol"""
+    if config[CONF_NODE_PROTOCOL] == PROTOCOL_SACN:
+        if CONF_NODE_NAME in config:
+            raise vol.Invalid("node_name needs Art-Net discovery, sACN nodes are addressed by host or multicast")
+        if 0 in config[CONF_NODE_UNIVERSES]:
+            raise vol.Invalid("sACN universes start at 1")
+        if config[CONF_NODE_SYNC]:
+            raise vol.Invalid("sync sends ArtSync and is only supported by Art-Net")
+        if config[CONF_NODE_BROADCAST]:
+            raise vol.Invalid("broadcast uses Art-Net discovery, sACN sends to multicast groups instead")
+        if not 0 < config.get(CONF_NODE_REFRESH, DEFAULT_REFRESH[PROTOCOL_SACN]) <= SACN_MAX_REFRESH:
+            raise vol.Invalid(f"refresh_every of sACN has to be more than 0 and at most {SACN_MAX_REFRESH}s, "
+                              f"receivers drop a source after 2.5s without packets")
+    else:
+        if CONF_NODE_HOST not in config and CONF_NODE_NAME not in config:
+            raise vol.Invalid("host or node_name is required")
+        if config[CONF_NODE_BROADCAST] and CONF_NODE_HOST not in config:
+            raise vol.Invalid("broadcast needs host, the directed broadcast address of the subnet")
+        for key in (CONF_NODE_PRIORITY, CONF_NODE_PREVIEW):
+            if key in config:
+                raise vol.Invalid(f"{key} is only supported by sACN")
+
+    config.setdefault(CONF_NODE_PORT, DEFAULT_PORTS[config[CONF_NODE_PROTOCOL]])
+    config.setdefault(CONF_NODE_REFRESH, DEFAULT_REFRESH[config[CONF_NODE_PROTOCOL]])
+    return config
+
+
+PLATFORM_SCHEMA = vol.All(PLATFORM_SCHEMA.extend(
     {
-        vol.Required(CONF_NODE_HOST): cv.string,
+        vol.Exclusive(CONF_NODE_HOST, CONF_NODE_HOST): cv.string,
+        vol.Exclusive(CONF_NODE_NAME, CONF_NODE_HOST): cv.string,
         vol.Required(CONF_NODE_UNIVERSES): {
             vol.All(int, vol.Range(min=0, max=1024)): {
-                vol.Optional(CONF_OUTPUT_CORRECTION, default=None): vol.Any(
-                    None, vol.In(AVAILABLE_CORRECTIONS)
-                ),
+                vol.Optional(CONF_OUTPUT_CORRECTION, default=None): OUTPUT_CORRECTION_SCHEMA,
                 CONF_DEVICES: vol.All(
                     cv.ensure_list,
-                    [
+                    [vol.All(
                         {
                             vol.Required(CONF_DEVICE_CHANNEL): vol.All(
                                 vol.Coerce(int), vol.Range(min=1, max=512)
@@ -869,9 +1963,8 @@ PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend(
                             vol.Optional(CONF_DEVICE_TRANSITION, default=0): vol.All(
                                 vol.Coerce(float), vol.Range(min=0, max=999)
                             ),
-                            vol.Optional(CONF_OUTPUT_CORRECTION, default=None): vol.Any(
-                                None, vol.In(AVAILABLE_CORRECTIONS)
-                            ),
+                            vol.Optional(CONF_DEVICE_EASING, default="linear"): vol.In(EASINGS),
+                            vol.Optional(CONF_OUTPUT_CORRECTION, default=None): OUTPUT_CORRECTION_SCHEMA,
                             vol.Optional(CONF_CHANNEL_SIZE, default="8bit"): vol.Any(
                                 None, vol.In(CHANNEL_SIZE)
                             ),
@@ -887,8 +1980,15 @@ PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend(
                             vol.Optional(CONF_CHANNEL_SETUP, default=None): vol.Any(
                                 None, cv.string
                             ),
-                        }
-                    ],
+                            vol.Optional(CONF_DEVICE_PIXELS): vol.All(
+                                vol.Coerce(int), vol.Range(min=1, max=512)
+                            ),
+                            vol.Optional(CONF_DEVICE_SEGMENTS): vol.All(
+                                vol.Coerce(int), vol.Range(min=0, max=512)
+                            ),
+                        },
+                        validate_device_type,
+                    )],
                 ),
                 vol.Optional(CONF_INITIAL_VALUES): vol.All(
                     cv.ensure_list,
@@ -905,14 +2005,68 @@ PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend(
                 ),
             },
         },
-        vol.Optional(CONF_NODE_PORT, default=6454): cv.port,
+        vol.Optional(CONF_NODE_PROTOCOL, default=PROTOCOL_ARTNET): vol.In(OUTPUT_PROTOCOLS),
+        vol.Optional(CONF_NODE_PORT): cv.port,
+        vol.Optional(CONF_NODE_PRIORITY): vol.All(
+            vol.Coerce(int), vol.Range(min=0, max=200)
+        ),
+        vol.Optional(CONF_NODE_PREVIEW): cv.boolean,
+        vol.Optional(CONF_NODE_SYNC, default=False): cv.boolean,
+        vol.Optional(CONF_NODE_BROADCAST, default=False): cv.boolean,
         vol.Optional(CONF_NODE_MAX_FPS, default=25): vol.All(
             vol.Coerce(int), vol.Range(min=1, max=50)
         ),
-        vol.Optional(CONF_NODE_REFRESH, default=120): vol.All(
-            vol.Coerce(int), vol.Range(min=0, max=9999)
+        vol.Optional(CONF_NODE_REFRESH): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=9999)
+        ),
+        vol.Optional(CONF_NODE_STATE_UPDATE, default=1): vol.All(
+            vol.Coerce(float), vol.Range(min=0.1, max=60)
         ),
+        vol.Optional(CONF_NODE_EXPOSE_DMX_VALUES, default=True): cv.boolean,
+        vol.Optional(CONF_NODE_DIAGNOSTICS, default=True): cv.boolean,
+        vol.Optional(CONF_NODE_RECEIVE, default=False): cv.boolean,
+        vol.Optional(CONF_NODE_RECEIVE_PORT): cv.port,
     },
     required=True,
     extra=vol.PREVENT_EXTRA,
+), validate_node_protocol)
+
+SCENE_TRANSITION_SCHEMA = vol.All(vol.Coerce(float), vol.Range(min=0, max=999))
+
+# The attributes of every light are checked before the first one is queued, so a scene is applied whole or not at all
+SCENE_LIGHT_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_STATE): vol.In([STATE_ON, STATE_OFF]),
+        vol.Optional(ATTR_BRIGHTNESS): vol.All(vol.Coerce(int), vol.Range(min=0, max=255)),
+        vol.Optional(ATTR_RGB_COLOR): vol.All(vol.Coerce(tuple), vol.ExactSequence((cv.byte,) * 3)),
+        vol.Optional(ATTR_RGBW_COLOR): vol.All(vol.Coerce(tuple), vol.ExactSequence((cv.byte,) * 4)),
+        vol.Optional(ATTR_RGBWW_COLOR): vol.All(vol.Coerce(tuple), vol.ExactSequence((cv.byte,) * 5)),
+        vol.Optional(ATTR_COLOR_TEMP): cv.positive_int,
+        vol.Optional(ATTR_EFFECT): vol.In(EFFECTS),
+        vol.Optional(ATTR_TRANSITION): SCENE_TRANSITION_SCHEMA,
+        vol.Optional(ATTR_EASING): vol.In(EASINGS),
+    }
+)
+
+APPLY_SCENE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_ENTITIES): {cv.entity_id: vol.Any(None, SCENE_LIGHT_SCHEMA)},
+        vol.Optional(ATTR_TRANSITION): SCENE_TRANSITION_SCHEMA,
+        vol.Optional(ATTR_EASING): vol.In(EASINGS),
+    }
+)
+
+APPLY_EFFECT_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_ENTITIES): cv.entity_ids,
+        vol.Required(ATTR_EFFECT): vol.In(EFFECTS),
+    }
+)
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_DURATION, default=30): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=600)
+        ),
+    }
 )
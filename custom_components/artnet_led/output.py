@@ -0,0 +1,1036 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import functools
+import logging
+import socket
+import struct
+import time
+import uuid
+from array import array
+from traceback import format_exc
+from typing import TYPE_CHECKING, Callable
+
+import pyartnet
+
+if TYPE_CHECKING:
+    from .effects import EffectRenderer
+
+log = logging.getLogger(__name__)
+
+ARTNET_HEADER_SIZE = 18
+DMX_SLOTS = 512
+
+
+class OutputCorrection:
+    """
+    Output correction curve, precomputed into a lookup table per channel size. Channels up to 16bit get
+    an entry for every value, wider channels interpolate between 65536 samples of the curve.
+    """
+
+    TABLE_SIZE = 0x10000
+
+    def __init__(self, name: str, function: Callable[[float, int], float]):
+        self.name = name
+        self._function = function
+        self._tables = {}
+
+    def table(self, max_val: int) -> array:
+        """Return the lookup table for channels with the given max value"""
+        table = self._tables.get(max_val)
+        if table is not None:
+            return table
+
+        function = self._function
+        if max_val < self.TABLE_SIZE:
+            table = array("L", (min(max_val, max(0, round(function(k, max_val)))) for k in range(max_val + 1)))
+        else:
+            step = max_val / self.TABLE_SIZE
+            table = array("d", (function(k * step, max_val) for k in range(self.TABLE_SIZE + 1)))
+
+        self._tables[max_val] = table
+        return table
+
+    def __call__(self, val: int, max_val: int = 0xFF) -> int:
+        table = self._tables.get(max_val)
+        if table is None:
+            table = self.table(max_val)
+
+        if max_val < self.TABLE_SIZE:
+            return table[val]
+
+        pos = val * self.TABLE_SIZE / max_val
+        index = int(pos)
+        if index >= self.TABLE_SIZE:
+            return min(max_val, max(0, round(table[self.TABLE_SIZE])))
+        low = table[index]
+        return min(max_val, max(0, round(low + (table[index + 1] - low) * (pos - index))))
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} {self.name}>"
+
+
+def gamma_correction(gamma: float) -> OutputCorrection:
+    """Output correction with a gamma curve"""
+    return OutputCorrection(f"gamma {gamma}", lambda val, max_val: max_val * (val / max_val) ** gamma)
+
+
+def curve_correction(points: list[float]) -> OutputCorrection:
+    """Output correction interpolating between evenly spaced points, 0 is off and 1 is full"""
+    points = tuple(points)
+    segments = len(points) - 1
+
+    def function(val: float, max_val: int) -> float:
+        pos = val / max_val * segments
+        index = min(int(pos), segments - 1)
+        low = points[index]
+        return max_val * (low + (points[index + 1] - low) * (pos - index))
+
+    return OutputCorrection(f"curve {list(points)}", function)
+
+
+class Easing:
+    """Easing curve of a fade, precomputed into a table so applying it costs one lookup per frame"""
+
+    TABLE_SIZE = 4096
+
+    def __init__(self, name: str, function: Callable[[float], float]):
+        self.name = name
+        self._table = array("d", (function(k / self.TABLE_SIZE) for k in range(self.TABLE_SIZE + 1)))
+
+    def __call__(self, progress: float) -> float:
+        return self._table[int(progress * self.TABLE_SIZE)]
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} {self.name}>"
+
+
+def cie_lightness(progress: float) -> float:
+    """Luminance for a lightness of progress * 100 (CIE 1976), fades look perceptually linear"""
+    lightness = progress * 100
+    if lightness <= 8:
+        return lightness / 903.3
+    return ((lightness + 16) / 116) ** 3
+
+
+EASINGS = {
+    "linear": None,
+    "ease_in": Easing("ease_in", lambda p: p * p),
+    "ease_out": Easing("ease_out", lambda p: 1 - (1 - p) * (1 - p)),
+    "ease_in_out": Easing("ease_in_out", lambda p: p * p * (3 - 2 * p)),
+    "cie_lightness": Easing("cie_lightness", cie_lightness),
+}
+
+
+@functools.lru_cache(maxsize=None)
+def channel_struct(format: str, width: int) -> struct.Struct:
+    """Channels of the same type and width share one compiled struct"""
+    return struct.Struct(">" + format * width)
+
+
+class OutputChannel(pyartnet.DmxChannel):
+    """
+    DmxChannel whose fades are run by the fade engine of its universe. The values are written
+    big endian straight into the frame buffer of the universe.
+
+    Large installs have thousands of channels, so all state is in slots. The constructor of
+    DmxChannel isn't called: it allocates the value and fade lists of the fade engine of pyartnet,
+    which aren't used here.
+    """
+
+    _FORMAT = "B"
+
+    __slots__ = (
+        "width", "start", "stop", "output_correction", "callback_value_changed", "callback_fade_finished",
+        "callback_values_received", "_universe", "_offset", "_struct", "_raw", "_values", "_fade_start", "_fade_target",
+        "_fade_start_time", "_fade_duration", "_fade_easing", "_fading", "_effect",
+    )
+
+    def __init__(self, universe: OutputUniverse, start: int, width: int):
+        if not isinstance(width, int) or width <= 0:
+            raise pyartnet.errors.ChannelWidthInvalid(f"Channel width must be int > 0: {width} ({type(width)})")
+        stop = start + width * self._CHANNEL_SIZE - 1
+        if not 1 <= start <= DMX_SLOTS or stop > DMX_SLOTS:
+            raise pyartnet.errors.ChannelOutOfUniverseError(
+                f"Channel out of universe (1..{DMX_SLOTS}): start: {start} width: {width} -> {stop}")
+
+        self.width = width
+        self.start = start
+        self.stop = stop
+        self.output_correction = None
+        self.callback_value_changed: Callable[[OutputChannel], None] | None = None
+        self.callback_fade_finished: Callable[[OutputChannel], None] | None = None
+        self.callback_values_received: Callable[[OutputChannel], None] | None = None
+
+        self._universe = universe
+        self._offset = start - 1
+        self._struct = channel_struct(self._FORMAT, width)
+
+        # Fade state, raw values are before and values after output correction
+        self._raw = [0] * width
+        self._values = [0] * width
+        self._fade_start = [0] * width
+        self._fade_target = [0] * width
+        self._fade_start_time = 0.0
+        self._fade_duration = 0.0
+        self._fade_easing: Easing | None = None
+        self._fading = False
+        self._effect: EffectRenderer | None = None
+
+    @property
+    def fade_running(self) -> bool:
+        return self._fading
+
+    @property
+    def effect(self) -> EffectRenderer | None:
+        return self._effect
+
+    def set_effect(self, effect: EffectRenderer | None):
+        """Render the values with an effect every frame, until the next fade or until the effect is removed"""
+        self._effect = effect
+        if effect is not None:
+            self._fading = False
+            self._universe.animate(self)
+        elif not self._fading:
+            self._universe.cancel_fade(self)
+
+    def get_channel_values(self) -> list[int]:
+        return self._values.copy()
+
+    def get_bytes(self) -> bytes:
+        buffer = bytearray(self.stop)
+        self.write(memoryview(buffer))
+        return bytes(buffer[self._offset:])
+
+    def add_fade(self, target_values: list[int], duration_ms: float, easing: Easing | None = None):
+        """
+        Fade from the current values to the target values. The fade follows the clock, a frame which
+        is late doesn't make the fade any longer.
+
+        If a fade is already running it is retargeted: it continues from where it is now towards the
+        new target, reusing the fade state of the channel instead of starting a new fade.
+        A running effect is stopped, the fade starts from its current frame.
+        """
+        if len(target_values) != self.width:
+            raise pyartnet.errors.ValueCountDoesNotMatchChannelWidthError(
+                f"Not enough fade values specified, expected {self.width} but got {len(target_values)}!")
+        for value in target_values:
+            if not 0 <= value <= self._CHANNEL_MAX:
+                raise pyartnet.errors.ChannelValueOutOfBounds(
+                    f"Target value out of bounds! 0 <= {value} <= {self._CHANNEL_MAX}")
+
+        self._fade_start[:] = self._raw
+        self._fade_target[:] = target_values
+        self._fade_start_time = time.monotonic()
+        self._fade_duration = duration_ms / 1000
+        self._fade_easing = easing
+        self._effect = None
+        if not self._fading:
+            self._fading = True
+            self._universe.start_fade(self)
+
+    def cancel_fades(self):
+        self._fading = False
+        self._effect = None
+        self._universe.cancel_fade(self)
+
+    def process(self):
+        # fades are processed by the universe
+        return self._fading
+
+    def step(self, now: float) -> bool:
+        """
+        Update the values to where the fade is at the given time, return False when the fade is finished.
+        Values which changed are written into the frame of the universe and mark it as dirty.
+        """
+        raw = self._raw
+        if self._effect is not None:
+            self._effect.render(now, raw)
+            self._output()
+            return True
+
+        elapsed = now - self._fade_start_time
+        if elapsed >= self._fade_duration:
+            raw[:] = self._fade_target
+            self._fading = False
+        else:
+            progress = elapsed / self._fade_duration
+            if self._fade_easing is not None:
+                progress = self._fade_easing(progress)
+
+            # update in place, a running fade doesn't allocate anything per frame
+            fade_start = self._fade_start
+            fade_target = self._fade_target
+            for i in range(self.width):
+                start = fade_start[i]
+                raw[i] = round(start + (fade_target[i] - start) * progress)
+
+        self._output()
+        return self._fading
+
+    def _output(self):
+        # A slow fade keeps the same output values for several frames, those frames needn't be sent again
+        if self.update_values():
+            universe = self._universe
+            self.write(universe.data)
+            universe.dirty = True
+
+    def update_values(self) -> bool:
+        """
+        Apply the output correction to the raw values
+        :return: True if an output value changed
+        """
+        correction = self.output_correction
+        if correction is None:
+            correction = self._universe.output_correction
+
+        raw = self._raw
+        values = self._values
+        if correction is None:
+            if values == raw:
+                return False
+            values[:] = raw
+            return True
+
+        changed = False
+        if isinstance(correction, OutputCorrection) and self._CHANNEL_MAX < OutputCorrection.TABLE_SIZE:
+            table = correction.table(self._CHANNEL_MAX)
+            for i in range(self.width):
+                value = table[raw[i]]
+                if values[i] != value:
+                    values[i] = value
+                    changed = True
+        else:
+            for i in range(self.width):
+                value = round(correction(raw[i], self._CHANNEL_MAX))
+                if values[i] != value:
+                    values[i] = value
+                    changed = True
+        return changed
+
+    def receive(self, values: list[int]):
+        """
+        Take over values which were set from outside, e.g. by a lighting desk. They are used as they are,
+        without inverting the output correction. A running fade or effect is stopped.
+        """
+        if self._fading or self._effect is not None:
+            self.cancel_fades()
+        self._raw[:] = values
+        self._values[:] = values
+        if self.callback_values_received is not None:
+            self.callback_values_received(self)
+
+    def read(self, buffer: memoryview) -> list[int]:
+        """Read the values of the channel from a frame"""
+        return list(self._struct.unpack_from(buffer, self._offset))
+
+    def write(self, buffer: memoryview):
+        """Write the values big endian into the buffer"""
+        self._struct.pack_into(buffer, self._offset, *self._values)
+
+
+class OutputChannel16Bit(OutputChannel):
+    _CHANNEL_SIZE: int = 2
+    _CHANNEL_MAX: int = 256 ** _CHANNEL_SIZE - 1
+    _FORMAT = "H"
+
+    __slots__ = ()
+
+
+class OutputChannel24Bit(OutputChannel):
+    _CHANNEL_SIZE: int = 3
+    _CHANNEL_MAX: int = 256 ** _CHANNEL_SIZE - 1
+    _FORMAT = "BH"
+
+    __slots__ = ()
+
+    def read(self, buffer: memoryview) -> list[int]:
+        parts = self._struct.unpack_from(buffer, self._offset)
+        return [high << 16 | low for high, low in zip(parts[::2], parts[1::2])]
+
+    def write(self, buffer: memoryview):
+        self._struct.pack_into(buffer, self._offset, *[
+            part for value in self._values for part in (value >> 16, value & 0xFFFF)
+        ])
+
+
+class OutputChannel32Bit(OutputChannel):
+    _CHANNEL_SIZE: int = 4
+    _CHANNEL_MAX: int = 256 ** _CHANNEL_SIZE - 1
+    _FORMAT = "I"
+
+    __slots__ = ()
+
+
+class OutputUniverse(pyartnet.DmxUniverse):
+    """
+    DmxUniverse whose data is a view into the preallocated packet of the universe. Channels write into it
+    directly and the packet is sent as is, so a frame needs no allocations.
+
+    The universe also is the fade engine for its channels: it keeps the channels with a running fade
+    and advances all of them in one pass per frame. Finished fades are dropped from the running set
+    and their callbacks are fired together after the frame is rendered.
+    """
+
+    def __init__(self, artnet_node: OutputNode, data: memoryview):
+        super().__init__(artnet_node)
+        self.data = data
+        self.dirty = True
+        self._fading = {}
+        self._channels: list[OutputChannel] = []
+        # The last frame received for this universe, see receive
+        self._received: bytearray | None = None
+
+    def add_channel(self, start: int, width: int, channel_name: str = '',
+                    channel_type: type[OutputChannel] = OutputChannel) -> OutputChannel:
+        assert issubclass(channel_type, OutputChannel), channel_type
+
+        channel = super().add_channel(start, width, channel_name, channel_type)
+        channel.write(self.data)
+        self._channels.append(channel)
+        self.dirty = True
+        return channel
+
+    @property
+    def fade_running(self) -> bool:
+        return bool(self._fading)
+
+    @property
+    def fade_count(self) -> int:
+        return len(self._fading)
+
+    def animate(self, channel: OutputChannel):
+        """Step the channel every frame until it reports that it's finished"""
+        self._fading[channel] = None
+
+    def start_fade(self, channel: OutputChannel):
+        self._fading[channel] = None
+
+        stats = self._artnet_node.stats
+        if stats is not None:
+            stats.fades_started += 1
+
+    def cancel_fade(self, channel: OutputChannel):
+        self._fading.pop(channel, None)
+
+    def receive(self, data: memoryview):
+        """
+        Take over a frame which was received for this universe. Only the channels whose values differ
+        from the previous received frame take over their values, so a desk which keeps sending the same
+        frame doesn't override the fades of Home Assistant. The first frame sets all channels.
+        """
+        received = self._received
+        if received is None:
+            received = self._received = bytearray(DMX_SLOTS)
+            changed_only = False
+        elif received.startswith(data):
+            return None
+        else:
+            changed_only = True
+
+        length = len(data)
+        for channel in self._channels:
+            start = channel._offset
+            end = channel.stop
+            if end > length:
+                continue
+            if changed_only and received[start:end] == data[start:end]:
+                continue
+            channel.receive(channel.read(data))
+            # The desk sends these values itself, they only go out again with the next refresh
+            self.data[start:end] = data[start:end]
+
+        received[:length] = data
+
+    def process(self, now: float | None = None) -> bool:
+        """
+        Advance all running fades to the given time
+        :return: True if a fade was processed
+        """
+        if not self._fading:
+            return False
+
+        if now is None:
+            now = time.monotonic()
+
+        dirty = self.dirty
+        finished = []
+        for channel in self._fading:
+            if not channel.step(now):
+                finished.append(channel)
+
+        # Fades which didn't change an output value this frame, the frame would be a duplicate
+        if not self.dirty and not dirty:
+            stats = self._artnet_node.stats
+            if stats is not None:
+                stats.frames_skipped += 1
+
+        for channel in finished:
+            del self._fading[channel]
+        for channel in finished:
+            if channel.callback_fade_finished is not None:
+                channel.callback_fade_finished(channel)
+        return True
+
+
+class OutputStats:
+    """
+    Counters of the output path of one node. Updating them is a few integer additions per tick,
+    so they can stay on all the time. Rates are derived by the reader from two snapshots.
+    """
+
+    # Upper bounds in ms of the tick jitter histogram, the last bucket takes everything above
+    JITTER_BUCKETS = (1, 2, 5, 10, 20, 50)
+
+    __slots__ = (
+        "frames", "packets_sent", "bytes_sent", "frames_refreshed", "frames_held_back", "frames_skipped",
+        "send_errors", "ticks", "jitter_total", "jitter_max", "jitter_histogram",
+        "bursts", "burst_time", "burst_max", "syncs_sent",
+        "fades_started", "state_writes", "renders", "render_time", "render_max",
+    )
+
+    def __init__(self):
+        self.frames = {}
+        self.packets_sent = 0
+        self.bytes_sent = 0
+        self.frames_refreshed = 0
+        self.frames_held_back = 0
+        self.frames_skipped = 0
+        self.send_errors = 0
+
+        self.ticks = 0
+        self.jitter_total = 0.0
+        self.jitter_max = 0.0
+        self.jitter_histogram = [0] * (len(self.JITTER_BUCKETS) + 1)
+
+        self.bursts = 0
+        self.burst_time = 0.0
+        self.burst_max = 0.0
+        self.syncs_sent = 0
+
+        self.fades_started = 0
+        self.state_writes = 0
+        self.renders = 0
+        self.render_time = 0.0
+        self.render_max = 0.0
+
+    def add_tick(self, late: float):
+        """Record how late in seconds a tick of the output loop woke up"""
+        self.ticks += 1
+        self.jitter_total += late
+        if late > self.jitter_max:
+            self.jitter_max = late
+
+        late_ms = late * 1000
+        for i, bound in enumerate(self.JITTER_BUCKETS):
+            if late_ms < bound:
+                self.jitter_histogram[i] += 1
+                break
+        else:
+            self.jitter_histogram[-1] += 1
+
+    def add_burst(self, duration: float):
+        """Record the time in seconds from the first to the last packet of a burst, including the sync"""
+        self.bursts += 1
+        self.burst_time += duration
+        if duration > self.burst_max:
+            self.burst_max = duration
+
+    def add_render(self, duration: float):
+        """Record the time in seconds it took to calculate the target values of a light"""
+        self.renders += 1
+        self.render_time += duration
+        if duration > self.render_max:
+            self.render_max = duration
+
+    def as_dict(self) -> dict:
+        bounds = [f"<{bound}ms" for bound in self.JITTER_BUCKETS] + [f">={self.JITTER_BUCKETS[-1]}ms"]
+        return {
+            "frames": {f"universe_{nr}": count for nr, count in self.frames.items()},
+            "packets_sent": self.packets_sent,
+            "bytes_sent": self.bytes_sent,
+            "frames_refreshed": self.frames_refreshed,
+            "frames_held_back": self.frames_held_back,
+            "frames_skipped": self.frames_skipped,
+            "send_errors": self.send_errors,
+            "ticks": self.ticks,
+            "jitter_max_ms": round(self.jitter_max * 1000, 3),
+            "jitter_histogram": dict(zip(bounds, self.jitter_histogram)),
+            "bursts": self.bursts,
+            "burst_max_ms": round(self.burst_max * 1000, 3),
+            "syncs_sent": self.syncs_sent,
+            "fades_started": self.fades_started,
+            "state_writes": self.state_writes,
+            "renders": self.renders,
+            "render_max_ms": round(self.render_max * 1000, 3),
+        }
+
+
+def source_address(host: str, port: int) -> str | None:
+    """Return the address of the interface the packets to host are sent from, nothing is sent to find it"""
+    with contextlib.suppress(OSError), socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+        sock.connect((host, port))
+        return sock.getsockname()[0]
+    return None
+
+
+class OutputTransport(asyncio.DatagramProtocol):
+    """
+    Datagram endpoint through which all universes of a node are sent. Sends never block, if the
+    socket buffer of the OS fills up the transport reports it as paused until it drained again.
+
+    A connected transport sends to one host. An unconnected one sends every packet to the address it is
+    given, which may be a broadcast or multicast address.
+
+    A host that is offline answers every packet with an ICMP error. Only the first error of such an
+    outage is logged as a warning, the following ones are counted in send_errors until a burst goes
+    through without an error again.
+    """
+
+    def __init__(self, name: str, stats: OutputStats | None = None):
+        self._name = name
+        self._stats = stats
+        self._transport: asyncio.DatagramTransport | None = None
+        self.paused = False
+        self.failing = False
+        self._errors = 0
+        self._checked_errors = 0
+
+    @classmethod
+    async def create(cls, host: str | None, port: int, connect: bool = True,
+                     stats: OutputStats | None = None) -> OutputTransport:
+        loop = asyncio.get_running_loop()
+        if connect:
+            _, protocol = await loop.create_datagram_endpoint(
+                lambda: cls(f"{host}:{port}", stats), remote_addr=(host, port)
+            )
+        else:
+            _, protocol = await loop.create_datagram_endpoint(
+                lambda: cls(f"{host}:{port}", stats), local_addr=("0.0.0.0", 0), allow_broadcast=True
+            )
+        return protocol
+
+    def connection_made(self, transport: asyncio.DatagramTransport):
+        self._transport = transport
+
+    def connection_lost(self, exc: Exception | None):
+        self._transport = None
+
+    def error_received(self, exc: Exception):
+        self._errors += 1
+        if self._stats is not None:
+            self._stats.send_errors += 1
+
+        if self.failing:
+            log.debug(f"Error sending to {self._name}: {exc}")
+        else:
+            self.failing = True
+            log.warning(f"Error sending to {self._name}: {exc}, further errors are counted until it's reachable")
+
+    def check_errors(self):
+        """Called before every burst, a failing host is reachable again if the last burst caused no error"""
+        if self.failing and self._errors == self._checked_errors:
+            self.failing = False
+            log.info(f"Sending to {self._name} works again")
+        self._checked_errors = self._errors
+
+    def pause_writing(self):
+        log.debug(f"Socket buffer for {self._name} is full, holding back frames")
+        self.paused = True
+
+    def resume_writing(self):
+        self.paused = False
+
+    @property
+    def connected(self) -> bool:
+        return self._transport is not None
+
+    @property
+    def local_address(self) -> tuple | None:
+        """Return the address the packets are sent from"""
+        if self._transport is None:
+            return None
+        return self._transport.get_extra_info("sockname")
+
+    def send(self, data: memoryview, address: tuple | None = None):
+        self._transport.sendto(data, address)
+
+    def close(self):
+        if self._transport is not None:
+            self._transport.close()
+
+
+class OutputNode(pyartnet.ArtNetNode):
+    """
+    Node with an output loop owned by the integration, the protocol of the packets is left to the
+    subclasses. Every tick the fades of all universes are processed first, then all universes whose data
+    changed are sent in one burst through one shared OutputTransport. Unchanged universes are only resent
+    every refresh_every seconds as keepalive. Each universe has one preallocated packet which is reused
+    for every frame, its DMX data starts at HEADER_SIZE.
+
+    With connect set, all packets go to host. Otherwise every universe is sent to its own destinations,
+    see set_destinations, and to its default destination as long as it has none. If the protocol sets
+    a sync packet, it is sent to every destination of a burst after its last universe.
+
+    If collect_stats is set the node keeps its OutputStats in stats, else stats is None.
+    """
+
+    HEADER_SIZE = 0
+
+    def __init__(self, host: str | None, port: int, max_fps: int = 25, refresh_every: int = 2,
+                 collect_stats: bool = True, connect: bool = True):
+        super().__init__(host, port, max_fps=max_fps, refresh_every=refresh_every)
+        self._host = host
+        self._port = port
+        self._connect = connect
+        self._destinations: dict[int, tuple] = {}
+
+        self._universes = {}
+        self._packets = {}
+        self._frames = {}
+        self._sent_time = {}
+
+        self._task = None
+        self._transport: OutputTransport | None = None
+        self._sync: bytes | None = None
+
+        self.stats: OutputStats | None = OutputStats() if collect_stats else None
+
+    def get_universe(self, nr: int) -> OutputUniverse:
+        return self._universes[nr]
+
+    def add_universe(self, nr: int = 0) -> OutputUniverse:
+        assert isinstance(nr, int), type(nr)
+        assert nr >= 0, nr
+
+        packet = self._packets[nr] = self._create_packet(nr)
+        self._destinations[nr] = self._default_destinations(nr)
+
+        self._universes[nr] = universe = OutputUniverse(self, memoryview(packet)[self.HEADER_SIZE:])
+        if self.stats is not None:
+            self.stats.frames[nr] = 0
+        return universe
+
+    def _create_packet(self, nr: int) -> bytearray:
+        """Return the packet of the universe, with room for all DMX slots after the header"""
+        raise NotImplementedError()
+
+    def _set_length(self, packet: bytearray, length: int):
+        """Write the number of DMX slots which are sent into the header of the packet"""
+        raise NotImplementedError()
+
+    def _stamp(self, nr: int, packet: bytearray):
+        """Prepare the header of the packet right before it is sent, e.g. its sequence number"""
+
+    @property
+    def universe_numbers(self) -> list[int]:
+        return list(self._universes)
+
+    def _default_destinations(self, nr: int) -> tuple:
+        # A connected transport already knows where to send to
+        return (None,) if self._connect else ((self._host, self._port),)
+
+    def set_destinations(self, nr: int, hosts: tuple[str, ...]):
+        """Send the universe to the given hosts instead of host, no hosts restore host"""
+        assert not self._connect, "A connected node only sends to its host"
+        if hosts:
+            self._destinations[nr] = tuple((host, self._port) for host in hosts)
+        else:
+            self._destinations[nr] = self._default_destinations(nr)
+
+    def get_destinations(self, nr: int) -> tuple:
+        return self._destinations[nr]
+
+    @property
+    def fade_count(self) -> int:
+        """Number of channels with a running fade"""
+        return sum(universe.fade_count for universe in self._universes.values())
+
+    @property
+    def local_address(self) -> tuple | None:
+        """Return the address the packets of the node are sent from, None if the node isn't running"""
+        if self._transport is None:
+            return None
+        return self._transport.local_address
+
+    @property
+    def own_addresses(self) -> tuple:
+        """Return the addresses the packets of the node come from when they loop back, e.g. as broadcast"""
+        address = self.local_address
+        if address is None:
+            return ()
+        if address[0] not in ("0.0.0.0", "::"):
+            return (address[:2],)
+
+        # An unconnected socket sends from the interface of the destination, its own address is 0.0.0.0
+        interface = source_address(self._host, self._port) if self._host is not None else None
+        return ((interface, address[1]),) if interface is not None else ()
+
+    async def start(self):
+        if self._task:
+            return None
+
+        # Output goes through the asyncio transport, the socket of pyartnet isn't needed
+        self._socket.close()
+        self._transport = await OutputTransport.create(self._host, self._port, self._connect, self.stats)
+        self._task = asyncio.create_task(self._worker())
+
+    async def stop(self):
+        if not self._task:
+            return None
+
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+
+        self._task = None
+        self._transport.close()
+        self._transport = None
+        log.debug(f"Output of {self._host}:{self._port} stopped")
+
+    async def _worker(self):
+        next_tick = time.monotonic()
+
+        while True:
+            # Schedule against the clock so a late tick doesn't delay all following ones
+            next_tick += self.sleep_time
+            now = time.monotonic()
+            if next_tick < now:
+                next_tick = now
+            await asyncio.sleep(next_tick - now)
+
+            try:
+                now = time.monotonic()
+                if self.stats is not None:
+                    self.stats.add_tick(now - next_tick)
+                for universe in self._universes.values():
+                    universe.process(now)
+                self._send(now, False)
+            except Exception:
+                log.error(f"Error in output loop for {self._host}:{self._port}:")
+                for line in format_exc().splitlines():
+                    log.error(line)
+
+    def update(self):
+        """Send all universes, regardless if their data changed"""
+        self._send(time.monotonic(), True)
+
+    def _get_frame(self, nr: int, length: int) -> memoryview:
+        """Return the part of the packet that has to be sent for the given number of channels"""
+        frame = self._frames.get(nr)
+        if frame is None or frame[0] != length:
+            packet = self._packets[nr]
+            self._set_length(packet, length)
+            frame = self._frames[nr] = (length, memoryview(packet)[:self.HEADER_SIZE + length])
+        return frame[1]
+
+    def _send(self, now: float, force: bool):
+        """Send every universe that changed or needs a refresh in one burst"""
+        transport = self._transport
+        if transport is None or not transport.connected:
+            return None
+
+        # The universes stay dirty, so they will be sent once the socket buffer drained
+        if transport.paused:
+            if self.stats is not None:
+                self.stats.frames_held_back += 1
+            return None
+
+        burst = []
+        for nr, universe in self._universes.items():
+            # don't send empty universes
+            length = universe.highest_channel
+            if length <= 0:
+                continue
+
+            refresh = not force and not universe.dirty
+            if refresh:
+                if self.refresh_every <= 0 or now - self._sent_time[nr] < self.refresh_every:
+                    continue
+
+            universe.dirty = False
+            self._sent_time[nr] = now
+            burst.append((nr, refresh, self._packets[nr], self._get_frame(nr, length)))
+
+        if not burst:
+            return None
+
+        # The errors of the previous burst have arrived by now
+        transport.check_errors()
+
+        stats = self.stats
+        if stats is not None:
+            start = time.perf_counter()
+
+        destinations = self._destinations
+        stamp = self._stamp
+        for nr, _, packet, frame in burst:
+            stamp(nr, packet)
+            for address in destinations[nr]:
+                transport.send(frame, address)
+
+        # The receiving nodes output all universes of the burst at once when the sync arrives
+        sync = self._sync
+        if sync is not None:
+            sync_addresses = {address for nr, _, _, _ in burst for address in destinations[nr]}
+            for address in sync_addresses:
+                transport.send(sync, address)
+
+        if stats is not None:
+            stats.add_burst(time.perf_counter() - start)
+            for nr, refresh, _, frame in burst:
+                sends = len(destinations[nr])
+                stats.frames[nr] += 1
+                stats.bytes_sent += len(frame) * sends
+                stats.frames_refreshed += refresh
+                stats.packets_sent += sends
+            if sync is not None:
+                stats.syncs_sent += len(sync_addresses)
+                stats.packets_sent += len(sync_addresses)
+                stats.bytes_sent += len(sync) * len(sync_addresses)
+
+
+# ArtSync with protocol version 14, sent after the ArtDmx packets of a burst
+ARTSYNC_PACKET = b"Art-Net\x00\x00\x52\x00\x0e\x00\x00"
+
+
+class ArtNetOutputNode(OutputNode):
+    """
+    OutputNode which sends ArtDmx packets, with one sequence number for all universes. With sync set
+    every burst is followed by an ArtSync, so nodes which support it output all universes together.
+    """
+
+    HEADER_SIZE = ARTNET_HEADER_SIZE
+
+    def __init__(self, host: str, port: int, max_fps: int = 25, refresh_every: int = 2,
+                 collect_stats: bool = True, connect: bool = True, sync: bool = False):
+        super().__init__(host, port, max_fps=max_fps, refresh_every=refresh_every,
+                         collect_stats=collect_stats, connect=connect)
+        self._sequence = 0
+        self._sync = ARTSYNC_PACKET if sync else None
+
+    def _create_packet(self, nr: int) -> bytearray:
+        packet = bytearray(ARTNET_HEADER_SIZE + DMX_SLOTS)
+        packet[0:8] = b"Art-Net\x00"
+        packet[8:10] = b"\x00\x50"  # Opcode ArtDMX 0x5000 (Little endian)
+        packet[10:12] = b"\x00\x0e"  # Protocol version 14
+        packet[14] = nr & 0xFF  # Universe LowByte
+        packet[15] = nr >> 8 & 0xFF  # Universe HighByte
+        return packet
+
+    def _set_length(self, packet: bytearray, length: int):
+        packet[16] = length >> 8 & 0xFF  # Number of channels Big endian
+        packet[17] = length & 0xFF
+
+    def _stamp(self, nr: int, packet: bytearray):
+        self._sequence = self._sequence % 255 + 1
+        packet[12] = self._sequence
+
+
+SACN_HEADER_SIZE = 126
+SACN_PORT = 5568
+SACN_MAX_UNIVERSE = 63999
+SACN_DEFAULT_PRIORITY = 100
+
+# Options of the framing layer
+SACN_PREVIEW_DATA = 0x80
+SACN_STREAM_TERMINATED = 0x40
+
+# Packets with the terminated flag sent when a source stops, as E1.31 asks for
+SACN_TERMINATE_PACKETS = 3
+
+
+def sacn_multicast_address(nr: int) -> str:
+    """Return the multicast group of a universe, 239.255.<high byte>.<low byte>"""
+    return f"239.255.{nr >> 8 & 0xFF}.{nr & 0xFF}"
+
+
+class SacnOutputNode(OutputNode):
+    """
+    OutputNode which sends E1.31 (sACN) data packets. Without host every universe is sent to its
+    multicast group, else all universes go to host. Every universe has its own sequence number.
+    The stream of every universe is terminated when the node stops, so receivers release it right away.
+    """
+
+    HEADER_SIZE = SACN_HEADER_SIZE
+
+    def __init__(self, host: str | None, port: int = SACN_PORT, max_fps: int = 25, refresh_every: int = 2,
+                 collect_stats: bool = True, priority: int = SACN_DEFAULT_PRIORITY, preview: bool = False,
+                 source_name: str = "Home Assistant", cid: bytes | None = None):
+        super().__init__(host, port, max_fps=max_fps, refresh_every=refresh_every,
+                         collect_stats=collect_stats, connect=False)
+        assert 0 <= priority <= 200, priority
+        self._priority = priority
+        self._options = SACN_PREVIEW_DATA if preview else 0
+        self._source_name = source_name.encode("utf-8")[:63]
+        # A stable CID lets receivers recognize the source again after a restart
+        self._cid = cid if cid is not None else uuid.uuid5(uuid.NAMESPACE_DNS, f"{source_name}/{host}:{port}").bytes
+
+    def add_universe(self, nr: int = 1) -> OutputUniverse:
+        assert 1 <= nr <= SACN_MAX_UNIVERSE, nr
+        return super().add_universe(nr)
+
+    def _default_destinations(self, nr: int) -> tuple:
+        if self._host is None:
+            return ((sacn_multicast_address(nr), self._port),)
+        return ((self._host, self._port),)
+
+    def _create_packet(self, nr: int) -> bytearray:
+        packet = bytearray(SACN_HEADER_SIZE + DMX_SLOTS)
+        # Root layer
+        packet[0:2] = b"\x00\x10"  # Preamble size
+        packet[4:16] = b"ASC-E1.17\x00\x00\x00"  # ACN packet identifier
+        packet[18:22] = b"\x00\x00\x00\x04"  # VECTOR_ROOT_E131_DATA
+        packet[22:38] = self._cid
+        # Framing layer
+        packet[40:44] = b"\x00\x00\x00\x02"  # VECTOR_E131_DATA_PACKET
+        packet[44:44 + len(self._source_name)] = self._source_name
+        packet[108] = self._priority
+        packet[112] = self._options
+        packet[113] = nr >> 8 & 0xFF  # Universe Big endian
+        packet[114] = nr & 0xFF
+        # DMP layer
+        packet[117] = 0x02  # VECTOR_DMP_SET_PROPERTY
+        packet[118] = 0xA1  # Address type and data type
+        packet[122] = 0x01  # Address increment
+        return packet
+
+    def _set_length(self, packet: bytearray, length: int):
+        # Flags and length of each layer count from the start of the layer to the end of the packet
+        size = SACN_HEADER_SIZE + length
+        for offset in (16, 38, 115):
+            pdu_length = size - offset
+            packet[offset] = 0x70 | pdu_length >> 8 & 0x0F
+            packet[offset + 1] = pdu_length & 0xFF
+        # Property value count includes the start code
+        packet[123] = (length + 1) >> 8 & 0xFF
+        packet[124] = (length + 1) & 0xFF
+
+    def _stamp(self, nr: int, packet: bytearray):
+        packet[111] = (packet[111] + 1) & 0xFF
+
+    async def stop(self):
+        transport = self._transport
+        if self._task and transport is not None and transport.connected:
+            for nr, universe in self._universes.items():
+                length = universe.highest_channel
+                if length <= 0:
+                    continue
+                packet = self._packets[nr]
+                packet[112] = self._options | SACN_STREAM_TERMINATED
+                frame = self._get_frame(nr, length)
+                for _ in range(SACN_TERMINATE_PACKETS):
+                    self._stamp(nr, packet)
+                    for address in self._destinations[nr]:
+                        transport.send(frame, address)
+                packet[112] = self._options
+        await super().stop()
+
+
+# Output nodes by the protocol they send
+OUTPUT_PROTOCOLS = {
+    "artnet": ArtNetOutputNode,
+    "sacn": SacnOutputNode,
+}
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Callable
+
+from .output import ARTNET_HEADER_SIZE, OutputUniverse
+
+log = logging.getLogger(__name__)
+
+ARTNET_ID = b"Art-Net\x00"
+OP_DMX = b"\x00\x50"  # Opcode ArtDMX 0x5000 (Little endian)
+OP_POLL = b"\x00\x20"  # Opcode ArtPoll 0x2000
+OP_POLL_REPLY = b"\x00\x21"  # Opcode ArtPollReply 0x2100
+
+
+class ArtNetReceiver(asyncio.DatagramProtocol):
+    """
+    Receives ArtDmx packets, e.g. of a lighting desk which drives the same universes, and hands the
+    DMX data to the universes with that number. The data is passed as a slice of a memoryview of the
+    datagram, nothing is copied until a universe takes over changed values.
+
+    Packets sent by the nodes of the integration itself, e.g. to a broadcast address, are ignored.
+    ArtPollReply packets are handed to poll_reply_handler if one is set, see ArtPollDiscovery.
+    """
+
+    def __init__(self, port: int, host: str = "0.0.0.0"):
+        self._host = host
+        self._port = port
+        self._transport: asyncio.DatagramTransport | None = None
+        self._universes: dict[int, list[OutputUniverse]] = {}
+        self._ignored: set[tuple] = set()
+        self.poll_reply_handler: Callable[[bytes, tuple], None] | None = None
+        self.packets_received = 0
+        self.packets_ignored = 0
+
+    @property
+    def port(self) -> int:
+        return self._port
+
+    def add_universe(self, nr: int, universe: OutputUniverse):
+        universes = self._universes.setdefault(nr, [])
+        if universe not in universes:
+            universes.append(universe)
+
+    def ignore(self, addresses: tuple):
+        """Ignore packets from the given (host, port) addresses, i.e. the packets of an output node"""
+        self._ignored.update(address[:2] for address in addresses)
+
+    async def start(self):
+        if self._transport is not None:
+            return None
+
+        loop = asyncio.get_running_loop()
+        await loop.create_datagram_endpoint(
+            lambda: self, local_addr=(self._host, self._port), allow_broadcast=True
+        )
+        log.debug(f"Receiving Art-Net on {self._host}:{self.local_address[1]}")
+
+    async def stop(self):
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+
+    @property
+    def local_address(self) -> tuple | None:
+        if self._transport is None:
+            return None
+        return self._transport.get_extra_info("sockname")
+
+    def send(self, data: bytes, address: tuple):
+        """Send a packet from the port of the receiver, so the answers to it are received"""
+        if self._transport is not None:
+            self._transport.sendto(data, address)
+
+    def connection_made(self, transport: asyncio.DatagramTransport):
+        self._transport = transport
+
+    def connection_lost(self, exc: Exception | None):
+        self._transport = None
+
+    def error_received(self, exc: Exception):
+        log.warning(f"Error receiving on {self._host}:{self._port}: {exc}")
+
+    def datagram_received(self, data: bytes, addr: tuple):
+        self.packets_received += 1
+
+        if len(data) < ARTNET_HEADER_SIZE or not data.startswith(ARTNET_ID) \
+                or addr[:2] in self._ignored:
+            self.packets_ignored += 1
+            return None
+
+        opcode = data[8:10]
+        if opcode != OP_DMX:
+            if opcode == OP_POLL_REPLY and self.poll_reply_handler is not None:
+                self.poll_reply_handler(data, addr)
+            else:
+                self.packets_ignored += 1
+            return None
+
+        universes = self._universes.get(data[14] | data[15] << 8)
+        if universes is None:
+            self.packets_ignored += 1
+            return None
+
+        length = data[16] << 8 | data[17]
+        dmx = memoryview(data)[ARTNET_HEADER_SIZE:ARTNET_HEADER_SIZE + length]
+        for universe in universes:
+            universe.receive(dmx)
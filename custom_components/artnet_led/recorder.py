@@ -0,0 +1,11 @@
+from __future__ import annotations
+
+from homeassistant.core import HomeAssistant, callback
+
+from .sensor import UNRECORDED_ATTRIBUTES
+
+
+@callback
+def exclude_attributes(hass: HomeAssistant) -> set[str]:
+    """Keep the raw counters of the diagnostic sensors out of the recorder"""
+    return set(UNRECORDED_ATTRIBUTES)
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import time
+from datetime import timedelta
+
+from homeassistant.components.sensor import SensorEntity, SensorStateClass
+from homeassistant.const import EntityCategory, UnitOfDataRate, UnitOfTime
+from homeassistant.core import HomeAssistant
+
+from .light import CONF_NODE_ID, DATA_NODES, DOMAIN, INTEGRATION_DOMAIN, ArtNetNodeManager, color_cache_info
+from .output import OutputStats
+
+SCAN_INTERVAL = timedelta(seconds=10)
+
+# key, name, unit, state class
+NODE_SENSORS = (
+    ("packets_per_second", "packets", "packets/s", SensorStateClass.MEASUREMENT),
+    ("bytes_per_second", "output", UnitOfDataRate.BYTES_PER_SECOND, SensorStateClass.MEASUREMENT),
+    ("frames_refreshed", "refreshed frames", "frames", SensorStateClass.TOTAL_INCREASING),
+    ("frames_held_back", "held back frames", "frames", SensorStateClass.TOTAL_INCREASING),
+    ("frames_skipped", "skipped frames", "frames", SensorStateClass.TOTAL_INCREASING),
+    ("send_errors", "send errors", "errors", SensorStateClass.TOTAL_INCREASING),
+    ("fades_running", "running fades", "fades", SensorStateClass.MEASUREMENT),
+    ("state_writes_per_second", "state writes", "writes/s", SensorStateClass.MEASUREMENT),
+    ("render_time", "render time", UnitOfTime.MILLISECONDS, SensorStateClass.MEASUREMENT),
+    ("tick_jitter", "tick jitter", UnitOfTime.MILLISECONDS, SensorStateClass.MEASUREMENT),
+    ("burst_spread", "burst spread", UnitOfTime.MILLISECONDS, SensorStateClass.MEASUREMENT),
+)
+
+# The raw counters change with every update, the recorder would store a new set of them every time
+UNRECORDED_ATTRIBUTES = frozenset(OutputStats().as_dict()) | {"color_cache"}
+
+
+async def async_setup_platform(hass: HomeAssistant, config, async_add_entities, discovery_info=None):
+    """Diagnostic sensors of a node, they are set up by the light platform for every node with diagnostics"""
+    if discovery_info is None:
+        return None
+
+    node_id = discovery_info[CONF_NODE_ID]
+    sampler = NodeStatsSampler(hass.data[INTEGRATION_DOMAIN][DATA_NODES], node_id)
+    async_add_entities((
+        NodeDiagnosticSensor(sampler, node_id, key, name, unit, state_class)
+        for key, name, unit, state_class in NODE_SENSORS
+    ), True)
+    return True
+
+
+class NodeStatsSampler:
+    """
+    Reads the OutputStats of a node once per update of its sensors. Rates are derived from the
+    difference to the previous sample, so nothing has to be averaged in the output loop itself.
+    """
+
+    # Sensors of a node which update within this many seconds share one sample
+    MAX_AGE = 1
+
+    def __init__(self, node_manager: ArtNetNodeManager, node_id: str):
+        self._node_manager = node_manager
+        self._node_id = node_id
+        self._stats = None
+        self._counters = None
+        self._time = 0.0
+        self.values: dict | None = None
+        self.details: dict | None = None
+
+    def sample(self) -> dict | None:
+        """Return the current values of the node, None if the node isn't running or collects no stats"""
+        node = self._node_manager.get_node(self._node_id)
+        stats = node.stats if node is not None else None
+        if stats is None:
+            self._stats = None
+            self.values = self.details = None
+            return None
+
+        now = time.monotonic()
+        if stats is self._stats and now - self._time < self.MAX_AGE:
+            return self.values
+
+        counters = (
+            stats.packets_sent, stats.bytes_sent, stats.state_writes,
+            stats.renders, stats.render_time, stats.ticks, stats.jitter_total,
+            stats.bursts, stats.burst_time,
+        )
+
+        values = {
+            "frames_refreshed": stats.frames_refreshed,
+            "frames_held_back": stats.frames_held_back,
+            "frames_skipped": stats.frames_skipped,
+            "send_errors": stats.send_errors,
+            "fades_running": node.fade_count,
+        }
+
+        # The counters of a restarted node start from 0 again, rates need a second sample of the new node
+        if stats is self._stats:
+            elapsed = now - self._time
+            packets, sent, writes, renders, render_time, ticks, jitter, bursts, burst_time = (
+                new - old for new, old in zip(counters, self._counters)
+            )
+            values["packets_per_second"] = round(packets / elapsed, 1)
+            values["bytes_per_second"] = round(sent / elapsed)
+            values["state_writes_per_second"] = round(writes / elapsed, 1)
+            values["render_time"] = round(render_time / renders * 1000, 3) if renders else 0
+            values["tick_jitter"] = round(jitter / ticks * 1000, 3) if ticks else 0
+            values["burst_spread"] = round(burst_time / bursts * 1000, 3) if bursts else 0
+
+        self._stats = stats
+        self._counters = counters
+        self._time = now
+        self.values = values
+        self.details = stats.as_dict()
+        # The color caches are shared by all nodes
+        self.details["color_cache"] = color_cache_info()
+        return values
+
+
+class NodeDiagnosticSensor(SensorEntity):
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    # Home Assistant before 2023.9 takes these from the recorder platform
+    _unrecorded_attributes = UNRECORDED_ATTRIBUTES
+
+    def __init__(self, sampler: NodeStatsSampler, node_id: str, key: str, name: str, unit: str,
+                 state_class: SensorStateClass):
+        self._sampler = sampler
+        self._key = key
+        self._attr_name = f"Art-Net {node_id} {name}"
+        self._attr_unique_id = f"{DOMAIN}:{node_id}/diagnostics/{key}"
+        self._attr_native_unit_of_measurement = unit
+        self._attr_state_class = state_class
+
+    async def async_update(self):
+        values = self._sampler.sample()
+        self._attr_available = values is not None
+        self._attr_native_value = values.get(self._key) if values is not None else None
+
+        # All counters of the node, e.g. the frames per universe and the jitter histogram, are on one sensor
+        if self._key == "packets_per_second":
+            self._attr_extra_state_attributes = self._sampler.details